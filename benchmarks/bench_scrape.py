@@ -0,0 +1,244 @@
+'''
+Times every stage of the extract_week / weekly_data path, through the
+functions of the specialchem package, on channel pages replayed from a
+local HTTP server, and prints a JSON report with the time and peak traced
+memory of each stage.
+
+usage:
+    python benchmarks/bench_scrape.py [--fixtures DIR] [--repeat N] [--output FILE]
+    python benchmarks/bench_scrape.py --parser lxml --restrict-parse --workers 8
+    python benchmarks/bench_scrape.py --synthetic-pages 40
+    python benchmarks/bench_scrape.py --record sun-care --pages 10
+
+The fixtures are html pages saved as DIR/<channel>_<n>.html, by default
+the recorded pages committed in tests/fixtures/channel. --record saves
+live specialchem pages there, and --synthetic-pages adds a generated
+channel with the same markup for a larger load.
+'''
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+import pandas as pd
+
+from specialchem import pages
+from specialchem.dates import parse_date, to_frame
+from specialchem.fetcher import fetch
+from specialchem.pages import fetch_pages, page_urls, parse_page, use_parser
+from specialchem.scrape import _write_excel, crawl
+from specialchem.weeks import rows_for_week
+
+default_fixtures = os.path.join(root, 'tests', 'fixtures', 'channel')
+fixture_name = re.compile(r'(.+)_(\d+)\.html$')
+
+def record(channel, total_pages, fixtures):
+    '''
+    Saves the first pages of a live channel as fixtures
+    '''
+    os.makedirs(fixtures, exist_ok=True)
+    for page_num, page_url in enumerate(page_urls(f'{pages.parent_url}/channel/{channel}', total_pages), start=1):
+        with open(os.path.join(fixtures, f'{channel}_{page_num}.html'), 'wb') as f:
+            f.write(fetch(page_url).content)
+
+def synthetic_page(page_num, total_pages, per_page=20, newest=date(2024, 6, 30)):
+    items = []
+    for item in range(per_page):
+        day = newest - timedelta(days=((page_num - 1) * per_page + item) // 3)
+        items.append(
+            f'<div class="item"><a class="titre float" href="/news/article-{page_num}-{item}">'
+            f'Sun care article {page_num}-{item}</a>'
+            f'<div class="date float dotted_line c5">Published on {day.strftime("%b %d, %Y")}</div>'
+            f'<p>{"lorem ipsum " * 40}</p></div>')
+    pagination = ''.join(f'<a href="?indexpage={n}">{n}</a>' for n in range(1, total_pages + 1))
+    return (f'<html><head><title>channel</title></head><body><nav>{"<a href=/x>menu</a>" * 50}</nav>'
+            f'{"".join(items)}<div class="products-pagination">{pagination}<a href="?indexpage=2">Next</a></div>'
+            f'</body></html>')
+
+def load_fixtures(fixtures, synthetic_pages):
+    '''
+    returns:
+        dict of channel -> list of page bodies, in page order
+    '''
+    recorded = {}
+    if os.path.isdir(fixtures):
+        for name in os.listdir(fixtures):
+            match = fixture_name.match(name)
+            if match:
+                with open(os.path.join(fixtures, name), 'rb') as f:
+                    recorded.setdefault(match.group(1), {})[int(match.group(2))] = f.read()
+    channels = {channel: [bodies[n] for n in sorted(bodies)] for channel, bodies in sorted(recorded.items())}
+    if synthetic_pages:
+        channels['synthetic'] = [synthetic_page(n, synthetic_pages).encode('utf-8')
+                                 for n in range(1, synthetic_pages + 1)]
+    return channels
+
+def serve(channels):
+    '''
+    Starts a local server answering /channel/<name>?indexpage=<n> with the fixtures
+    returns:
+        the server, already serving from a background thread
+    '''
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            channel = url.path.rstrip('/').split('/')[-1]
+            page_num = int(parse_qs(url.query).get('indexpage', ['1'])[0])
+            bodies = channels.get(channel, [])
+            if not 1 <= page_num <= len(bodies):
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = bodies[page_num - 1]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def measure(function, *args):
+    '''
+    returns:
+        result of the function, seconds it took and peak traced memory in bytes
+    '''
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    return result, seconds, tracemalloc.get_traced_memory()[1]
+
+def stage_fetch(urls):
+    return [fetch(page_url).content for page_url in urls]
+
+def stage_parse(contents):
+    # the backend set with use_parser, like every crawl
+    return [row for content in contents for row in parse_page(content)]
+
+def stage_fetch_pages(urls, workers):
+    return [row for rows in fetch_pages(urls, max_workers=workers) for row in rows]
+
+def stage_crawl(channel_urls, workers):
+    # the whole extract_week crawl: first page, pagination, then every page
+    return [row for url in channel_urls for row in crawl(url, workers=workers)]
+
+def stage_normalize(data):
+    # the parse cache is cleared so every repeat measures the first parse
+    parse_date.cache_clear()
+    return to_frame(data)[0]
+
+def stage_weekly(df):
+    return rows_for_week(df, df['Date'].max())
+
+def stage_export(df):
+    with tempfile.TemporaryDirectory() as directory:
+        _write_excel(df, os.path.join(directory, 'export.xlsx'))
+
+stages = ['fetch', 'parse', 'fetch_pages', 'crawl', 'normalize_dates', 'weekly_grouping', 'export']
+
+def run(channels, base_url, workers):
+    '''
+    returns:
+        dict of stage -> (seconds, peak bytes), number of rows extracted
+    '''
+    channel_urls = [f'{base_url}/channel/{channel}' for channel in channels]
+    urls = [page_url for channel_url, bodies in zip(channel_urls, channels.values())
+            for page_url in page_urls(channel_url, len(bodies))]
+    results = {}
+    contents, *results['fetch'] = measure(stage_fetch, urls)
+    _, *results['parse'] = measure(stage_parse, contents)
+    _, *results['fetch_pages'] = measure(stage_fetch_pages, urls, workers)
+    data, *results['crawl'] = measure(stage_crawl, channel_urls, workers)
+    df, *results['normalize_dates'] = measure(stage_normalize, data)
+    _, *results['weekly_grouping'] = measure(stage_weekly, df)
+    _, *results['export'] = measure(stage_export, df)
+    return results, len(data)
+
+def git_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraping hot paths on recorded channel pages')
+    parser.add_argument('--fixtures', default=default_fixtures, help='directory of the recorded pages')
+    parser.add_argument('--synthetic-pages', type=int, default=0, help='pages of a generated channel to add')
+    parser.add_argument('--parser', choices=['html.parser', 'lxml', 'selectolax'], default='html.parser',
+                        help='parser backend of the channel pages')
+    parser.add_argument('--restrict-parse', action='store_true', help='only build the headline and date nodes')
+    parser.add_argument('--workers', type=int, default=1, help='pages fetched at the same time')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage, the fastest is reported')
+    parser.add_argument('--output', help='file to write the JSON report to (stdout if omitted)')
+    parser.add_argument('--record', metavar='CHANNEL', help='record live pages of CHANNEL instead of benchmarking')
+    parser.add_argument('--pages', type=int, default=10, help='number of pages to record')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.pages, args.fixtures)
+        return
+
+    channels = load_fixtures(args.fixtures, args.synthetic_pages)
+    if not channels:
+        parser.error(f'no recorded page in {args.fixtures}, record some or use --synthetic-pages')
+    use_parser(args.parser, args.restrict_parse)
+    server = serve(channels)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    tracemalloc.start()
+    runs = [run(channels, base_url, args.workers) for _ in range(args.repeat)]
+    tracemalloc.stop()
+    server.shutdown()
+
+    report = {
+        'version': git_version(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'parser': args.parser,
+        'restrict_parse': args.restrict_parse,
+        'workers': args.workers,
+        'pages': sum(len(bodies) for bodies in channels.values()),
+        'bytes': sum(len(body) for bodies in channels.values() for body in bodies),
+        'rows': runs[0][1],
+        'repeat': args.repeat,
+        'stages': {},
+    }
+    for name in stages:
+        report['stages'][name] = {
+            'seconds': min(results[name][0] for results, _ in runs),
+            'peak_bytes': max(results[name][1] for results, _ in runs),
+        }
+    report['total_seconds'] = sum(stage['seconds'] for stage in report['stages'].values())
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
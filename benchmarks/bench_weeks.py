@@ -0,0 +1,68 @@
+'''
+Compares the groupby(...).apply(list(zip)) week lookup used by weekly_data
+with the vectorized WeekIndex on a synthetic dataframe.
+
+usage:
+    python benchmarks/bench_weeks.py [rows]
+'''
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from specialchem.weeks import rows_for_week, rows_for_weeks
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Headline': [f'headline {i}' for i in range(rows)],
+        'URL': [f'https://cosmetics.specialchem.com/news/{i}' for i in range(rows)],
+        'Date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D'),
+    })
+
+def groupby_week(df, week_date):
+    weekly_data = df.groupby(pd.Grouper(key='Date', freq='W')).apply(lambda x: list(zip(x['Headline'], x['URL'], x['Date']))).to_dict()
+    date = pd.to_datetime(week_date)
+    week_updates = []
+    for week_start, headlines in weekly_data.items():
+        week_end = week_start + pd.DateOffset(days=6)
+        if date >= week_start and date <= week_end:
+            week_updates = headlines
+    return week_updates
+
+def groupby_weeks(df, start_date, end_date):
+    weekly_data = df.groupby(pd.Grouper(key='Date', freq='W')).apply(lambda x: list(zip(x['Headline'], x['URL'], x['Date']))).to_dict()
+    week_updates = []
+    for week_start, headlines in weekly_data.items():
+        week_end = week_start + pd.DateOffset(days=6)
+        if (week_start >= start_date) and (week_end <= end_date):
+            week_updates += headlines
+    return week_updates
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main(rows):
+    df = synthetic_frame(rows)
+    week_date = pd.Timestamp('2020-06-17')
+    start_date, end_date = pd.Timestamp('2020-01-01'), pd.Timestamp('2020-12-31')
+
+    old_week, old_week_time = timed(groupby_week, df, week_date)
+    new_week, new_week_time = timed(rows_for_week, df, week_date)
+    old_range, old_range_time = timed(groupby_weeks, df, start_date, end_date)
+    new_range, new_range_time = timed(rows_for_weeks, df, start_date, end_date)
+
+    assert old_week == new_week
+    assert old_range == new_range
+
+    print(f'{rows} rows')
+    print(f'week:  groupby {old_week_time:.3f}s  week index {new_week_time:.3f}s  ({old_week_time / new_week_time:.0f}x)')
+    print(f'range: groupby {old_range_time:.3f}s  week index {new_range_time:.3f}s  ({old_range_time / new_range_time:.0f}x)')
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
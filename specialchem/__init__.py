@@ -0,0 +1,28 @@
+'''
+Scrapers of the specialchem channel updates, as a library and a CLI
+(python -m specialchem --help).
+
+The functions are loaded on first access, so importing the package does
+not import pandas or bs4. The building blocks (fetcher, pages, dates,
+store, ...) are submodules of the package: from specialchem.pages import
+fetch_pages.
+'''
+import importlib
+
+_exports = {
+    'extract_week': 'scrape',
+    'extract_range': 'scrape',
+    'weekly_data': 'scrape',
+    'range_data': 'scrape',
+    'resolve_date': 'scrape',
+    'load_manifest': 'batch',
+    'run_batch': 'batch',
+    'main': 'cli',
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return getattr(importlib.import_module(f'.{_exports[name]}', __name__), name)
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from .dates import date_rows
+from .fetcher import backoff_delay, get_rate_limiter, retry_statuses
+from .metrics import metrics
+from .ratelimit import retry_after
+from .pages import get_total_pages, page_urls, parse_page, week_first_day
+from .weeks import rows_for_week
+
+async def fetch_content(session, url, semaphore, retries=3, backoff=0.5):
+    '''
+    parameters:
+        session: aiohttp.ClientSession to use
+        url: url to request
+        semaphore: asyncio.Semaphore bounding the requests in flight
+        retries: number of times a timeout, connection error, 429 or 5xx is retried
+        backoff: base delay in seconds between two attempts (or the Retry-After delay if longer)
+    returns:
+        body of the response
+    '''
+    import aiohttp
+
+    # the rate limiter set on fetcher is shared with the threaded fetch paths
+    limiter = get_rate_limiter()
+    attempt = 0
+    start = time.perf_counter()
+    while True:
+        delay = backoff_delay(attempt, backoff)
+        try:
+            async with semaphore:
+                if limiter is not None:
+                    waited = time.perf_counter()
+                    await limiter.acquire_async()
+                    # the latency is the time spent on the requests, not waiting for the limiter
+                    start += time.perf_counter() - waited
+                sent = time.perf_counter()
+                async with session.get(url) as response:
+                    wait = retry_after(response.headers.get('Retry-After'))
+                    if limiter is not None:
+                        limiter.on_response(response.status, time.perf_counter() - sent, wait)
+                    if response.status not in retry_statuses or attempt >= retries:
+                        body = await response.read()
+                        metrics.record_request(response.status, time.perf_counter() - start, attempt, len(body))
+                        response.raise_for_status()
+                        return body
+                    if wait is not None:
+                        delay = max(delay, wait)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if limiter is not None:
+                limiter.on_error()
+            if attempt >= retries:
+                metrics.record_request(None, time.perf_counter() - start, attempt, 0)
+                raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def _crawl(session, url, start_date, end_date, semaphore):
+    soup = BeautifulSoup(await fetch_content(session, url, semaphore), 'html.parser')
+    urls = page_urls(url, get_total_pages(soup))
+
+    # every page is scheduled at once, the semaphore bounds how many are in flight
+    tasks = [asyncio.ensure_future(fetch_content(session, page_url, semaphore)) for page_url in urls]
+    data = []
+    try:
+        for task in tasks:
+            content = await task
+            with metrics.stage('parse'):
+                rows = parse_page(content)
+            metrics.record_page(len(rows))
+            # the rows without a date are left out, logged and counted in the metrics
+            dated = date_rows(rows)
+            data += [row for row in dated
+                     if (start_date is None or row[2] >= start_date) and (end_date is None or row[2] <= end_date)]
+            # pages are newest-first: once a page is older than the window the rest is too
+            if not rows or (start_date is not None and dated and max(row[2] for row in dated) < start_date):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    df = pd.DataFrame(data, columns=['Headline', 'URL', 'Date'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+def _session(concurrency):
+    import aiohttp
+
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(sock_connect=5, sock_read=30),
+        connector=aiohttp.TCPConnector(limit=concurrency),
+    )
+
+async def extract_range_async(url, start_date, end_date, concurrency=8, session=None, semaphore=None):
+    '''
+    parameters:
+        url: url of the channel
+        start_date: start date of the range to retrieve the results
+        end_date: end date of the range to retrieve the results
+        concurrency: maximum number of requests in flight
+        session: aiohttp.ClientSession to share between queries (one is created if None)
+        semaphore: asyncio.Semaphore to share between queries (one is created if None)
+    returns:
+        dataframe of the articles between start_date and end_date, the requests of
+        the pages older than start_date are cancelled before being sent
+    '''
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date)
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+    if session is not None:
+        return await _crawl(session, url, start_date, end_date, semaphore)
+    async with _session(concurrency) as session:
+        return await _crawl(session, url, start_date, end_date, semaphore)
+
+async def extract_week_async(url, week_date, concurrency=8, session=None, semaphore=None):
+    '''
+    parameters:
+        url: url of the channel
+        week_date: date of the week to retrieve the results
+        concurrency: maximum number of requests in flight
+        session: aiohttp.ClientSession to share between queries (one is created if None)
+        semaphore: asyncio.Semaphore to share between queries (one is created if None)
+    returns:
+        week updates, the same (Headline, URL, Date) tuples as extract_data
+    '''
+    start_date = week_first_day(pd.to_datetime(week_date))
+    df = await extract_range_async(url, start_date, start_date + timedelta(days=6), concurrency, session, semaphore)
+    return rows_for_week(df, week_date)
+
+async def run_queries(queries, concurrency=16):
+    '''
+    parameters:
+        queries: list of (url, week_date) or (url, start_date, end_date) tuples
+        concurrency: maximum number of requests in flight across all the queries
+    returns:
+        list with the result of every query, in the same order
+    '''
+    semaphore = asyncio.Semaphore(concurrency)
+    async with _session(concurrency) as session:
+        jobs = []
+        for query in queries:
+            if len(query) == 2:
+                jobs.append(extract_week_async(*query, session=session, semaphore=semaphore))
+            else:
+                jobs.append(extract_range_async(*query, session=session, semaphore=semaphore))
+        return await asyncio.gather(*jobs)
+
+def extract_range(url, start_date, end_date, concurrency=8):
+    '''
+    Blocking version of extract_range_async for scripts (not for code already
+    running inside an event loop, which should await extract_range_async)
+    '''
+    return asyncio.run(extract_range_async(url, start_date, end_date, concurrency))
+
+def extract_week(url, week_date, concurrency=8):
+    '''
+    Blocking version of extract_week_async for scripts (not for code already
+    running inside an event loop, which should await extract_week_async)
+    '''
+    return asyncio.run(extract_week_async(url, week_date, concurrency))
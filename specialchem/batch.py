@@ -0,0 +1,149 @@
+'''
+Runs a manifest of channels and date windows in one process. Every job
+goes through the same pooled session, response cache, rate limiter and
+article store.
+
+A manifest is a json file:
+
+    {
+        "defaults": {"workers": 8, "xls": true},
+        "jobs": [
+            {"channel": "sun-care", "week": "today-7"},
+            {"channel": "skin-care", "start": "2024-01-01", "end": "2024-03-31"},
+            {"channels": ["sun-care", "hair-care"], "keywords": ["uv", "filter"], "match": "any"},
+            {"channel": "hair-care", "keywords": "uv,filter"}
+        ]
+    }
+
+A job with "week" runs the week mode, one with "start" and "end" the range
+mode and one with "keywords" (a list or a comma separated string) the
+keyword mode. Dates accept 'today' and 'today-N' so the same manifest can
+be scheduled every week.
+'''
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .scrape import channel_name, checkpoint_path, extract_range, extract_week
+
+log = logging.getLogger(__name__)
+
+def load_manifest(path):
+    '''
+    parameters:
+        path: json manifest file
+    returns:
+        list of the jobs, each with the manifest defaults filled in
+    '''
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+    defaults = manifest.get('defaults', {})
+    return [{**defaults, **job} for job in manifest['jobs']]
+
+def job_mode(job):
+    if 'keywords' in job:
+        return 'keywords'
+    if 'week' in job:
+        return 'week'
+    if 'start' in job and 'end' in job:
+        return 'range'
+    return None
+
+def job_keywords(job):
+    '''
+    parameters:
+        job: keyword job of the manifest
+    returns:
+        list of the keywords, given either as a list or as a comma separated string
+    '''
+    keywords = job['keywords']
+    if isinstance(keywords, str):
+        keywords = keywords.split(',')
+    if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+        raise ValueError(f'keywords of job {job!r} must be a list of strings or a comma separated string')
+    keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+    if not keywords:
+        raise ValueError(f'job {job!r} has no keywords')
+    return keywords
+
+def run_job(job, store=None, seen=None, directory='.'):
+    '''
+    parameters:
+        job: one job of the manifest
+        store: ArticleStore shared by the jobs (None to skip)
+        seen: SeenStore shared by the incremental jobs
+        directory: directory of the excel sheets and checkpoints
+    returns:
+        dict with the mode, channel and number of rows of the job
+    '''
+    from .checkpoint import CrawlCheckpoint
+    from .crawler import channel_url
+
+    mode = job_mode(job)
+    if mode is None:
+        raise ValueError(f'job {job!r} has no week, start / end or keywords')
+    if mode == 'keywords':
+        from .keywords import filter_channels
+
+        channels = job.get('channels') or [job['channel']]
+        df = filter_channels(channels, job_keywords(job), mode=job.get('match', 'all'),
+                             max_workers=job.get('workers', 8))
+        if job.get('xls'):
+            names = '+'.join(channel_name(channel_url(channel)) for channel in channels)
+            df.to_excel(os.path.join(directory, f'{names} keywords.xlsx'), index=False)
+        return {'mode': mode, 'channel': ','.join(channels), 'rows': len(df)}
+
+    url = channel_url(job['channel'])
+    options = {
+        'xls': job.get('xls', False),
+        'workers': job.get('workers', 8),
+        'incremental': job.get('incremental', False),
+        'store': store,
+        'seen': seen,
+        'directory': directory,
+    }
+    if job.get('checkpoint'):
+        dates = [job['week']] if mode == 'week' else [job['start'], job['end']]
+        options['checkpoint'] = CrawlCheckpoint(checkpoint_path(url, mode, dates, directory))
+    if mode == 'week':
+        _, week_updates = extract_week(url, job['week'], **options)
+        return {'mode': mode, 'channel': channel_name(url), 'rows': len(week_updates) if isinstance(week_updates, list) else 0}
+    df = extract_range(url, job['start'], job['end'], **options)
+    return {'mode': mode, 'channel': channel_name(url), 'rows': len(df)}
+
+def run_batch(jobs, store=None, parallel=1, directory='.'):
+    '''
+    parameters:
+        jobs: jobs of a manifest (see load_manifest)
+        store: ArticleStore shared by the jobs (None to skip)
+        parallel: number of jobs run at the same time
+        directory: directory of the excel sheets, checkpoints and seen articles
+    returns:
+        list with the result of every job in order, a failed job has its error
+        instead of stopping the others
+    '''
+    from .seen import SeenStore
+
+    # the incremental jobs remember their articles next to their sheets
+    seen = SeenStore(os.path.join(directory, 'seen_articles.json'))
+
+    def run(job):
+        start = time.perf_counter()
+        try:
+            result = run_job(job, store, seen, directory)
+            result['status'] = 'ok'
+        except Exception as e:
+            log.exception('job %r failed', job)
+            result = {'mode': job_mode(job),
+                      'channel': job.get('channel') or ','.join(job.get('channels', [])), 'rows': 0,
+                      'status': 'error', 'error': str(e)}
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        log.info('job %s', json.dumps(result))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(parallel, 1)) as executor:
+        return list(executor.map(run, jobs))
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+class OfflineCacheMiss(requests.exceptions.RequestException):
+    '''
+    Raised in offline mode when a page was never cached
+    '''
+
+class ResponseCache:
+    '''
+    On-disk cache of page responses keyed by url.
+
+    Entries younger than ttl are served without any request, older ones are
+    revalidated with If-None-Match / If-Modified-Since so unchanged pages only
+    cost a 304. Entries older than max_age are evicted, and the least recently
+    used ones are evicted once the cache grows past max_bytes. In offline mode
+    every page is replayed from the cache and the network is never used.
+    '''
+    def __init__(self, directory='.http_cache', ttl=3600, max_age=7 * 24 * 3600,
+                 max_bytes=200 * 1024 * 1024, offline=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+        if offline:
+            # a replay must not lose pages, only count what is there
+            self._total = sum(size for _, size, _ in self._entries())
+        else:
+            self.evict()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def get(self, url):
+        '''
+        parameters:
+            url: url of the page
+        returns:
+            cached entry (dict with the metadata and the body) or None
+        '''
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+        except (OSError, ValueError):
+            return None
+        # the body mtime is the last access time used by the size eviction
+        os.utime(body_path)
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def conditional_headers(self, entry):
+        '''
+        parameters:
+            entry: cached entry of the page
+        returns:
+            headers that turn the request into a revalidation of the entry
+        '''
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, response):
+        '''
+        parameters:
+            url: url of the page
+            response: 200 response to store
+        '''
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'headers': dict(response.headers),
+        }
+        with self._lock:
+            if os.path.exists(body_path):
+                self._total -= os.path.getsize(body_path)
+            _write_atomic(body_path, response.content)
+            _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+            self._total += len(response.content)
+            over_size = self._total > self.max_bytes
+        if over_size:
+            self.evict()
+
+    def refresh(self, url, entry):
+        '''
+        Marks a revalidated (304) entry as fresh again
+        '''
+        meta_path, _ = self._paths(url)
+        entry = {key: value for key, value in entry.items() if key != 'body'}
+        entry['stored_at'] = time.time()
+        with self._lock:
+            _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+
+    def to_response(self, url, entry):
+        '''
+        returns:
+            requests.Response built from the cached entry
+        '''
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = entry['body']
+        response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.body'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path[:-len('.body')]))
+        return entries
+
+    def evict(self):
+        '''
+        Removes the entries older than max_age, then the least recently used
+        ones until the cache fits in max_bytes
+        '''
+        with self._lock:
+            entries = sorted(self._entries())
+            now = time.time()
+            total = sum(size for _, size, _ in entries)
+            for _, size, base in entries:
+                expired = self._stored_at(base) < now - self.max_age
+                if not expired and total <= self.max_bytes:
+                    continue
+                for path in (base + '.json', base + '.body'):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+            self._total = total
+
+    def _stored_at(self, base):
+        try:
+            with open(base + '.json', encoding='utf-8') as f:
+                return json.load(f)['stored_at']
+        except (OSError, ValueError, KeyError):
+            return 0
+
+def _write_atomic(path, data):
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
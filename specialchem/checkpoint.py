@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+class CrawlCheckpoint:
+    '''
+    Journal of the channel pages already fetched by a crawl, so a crawl that
+    dies halfway can be restarted without refetching them.
+
+    The json lines file starts with a header ({channel, total_pages,
+    fingerprint, started}) followed by one line per completed page ({url,
+    rows}), appended and flushed as soon as the page is parsed. A checkpoint
+    is only resumed for the same channel with the same number of pages and
+    the same fingerprint (the newest article of the first page), and while it
+    is younger than max_age: a new article shifts every row one place down
+    the pages, so the pages are then fetched again.
+    '''
+    def __init__(self, path='crawl_checkpoint.jsonl', max_age=timedelta(days=1)):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.pages = {}
+
+    def _read(self):
+        header, pages = None, {}
+        if not os.path.exists(self.path):
+            return header, pages
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a crash can leave the last line half written
+                    continue
+                if header is None:
+                    header = record
+                elif 'url' in record:
+                    pages[record['url']] = [tuple(row) for row in record['rows']]
+        return header, pages
+
+    def start(self, channel, total_pages, fingerprint=None):
+        '''
+        parameters:
+            channel: url of the channel being crawled
+            total_pages: number of pages in the channel
+            fingerprint: url of the first article on the first page, as just fetched
+        returns:
+            dict of page url -> (Headline, URL, Date) rows of the pages already fetched
+        '''
+        header, pages = self._read()
+        resumable = (header is not None
+                     and header.get('channel') == channel
+                     and header.get('total_pages') == total_pages
+                     and header.get('fingerprint') == fingerprint
+                     and datetime.now() - datetime.fromisoformat(header['started']) <= self.max_age)
+        if not resumable:
+            header = {'channel': channel, 'total_pages': total_pages, 'fingerprint': fingerprint,
+                      'started': datetime.now().isoformat(timespec='seconds')}
+            pages = {}
+
+        # rewrite the journal without any torn line before appending to it
+        with self._lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header) + '\n')
+                for url, rows in pages.items():
+                    f.write(json.dumps({'url': url, 'rows': rows}) + '\n')
+            os.replace(tmp_path, self.path)
+            self.pages = pages
+        return dict(pages)
+
+    def record(self, url, rows):
+        '''
+        parameters:
+            url: url of the page fetched
+            rows: (Headline, URL, Date) tuples parsed from the page
+        '''
+        line = json.dumps({'url': url, 'rows': rows}) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pages[url] = [tuple(row) for row in rows]
+
+    def clear(self):
+        '''
+        Removes the journal once the crawl is complete
+        '''
+        with self._lock:
+            self.pages = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
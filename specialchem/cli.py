@@ -0,0 +1,203 @@
+'''
+usage:
+    python -m specialchem week sun-care 2024-04-05 --xls
+    python -m specialchem range skin-care 2024-01-01 2024-03-31 --enrich
+    python -m specialchem keywords sun-care --keywords uv,filter --match any --output links.xlsx
+    python -m specialchem batch manifest.json --parallel 2
+
+Channels are names (sun-care) or urls. Dates are %Y-%m-%d, 'today' or
+'today-N'. The updates found are printed as tab separated lines on stdout
+(date, headline, url, then the author and tags with --enrich), the logs and
+the run summary go to stderr.
+'''
+import argparse
+import logging
+import sys
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='specialchem', description='Scrape the specialchem channel updates',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=8,
+                        help='pages fetched at the same time per channel (at most --per-host requests in flight)')
+    common.add_argument('--per-host', type=int, default=4,
+                        help='requests in flight against the site at most, whatever the number of workers')
+    common.add_argument('--xls', action='store_true', help='save the results in excel sheets')
+    common.add_argument('--parser', choices=['html.parser', 'lxml', 'selectolax'], default='html.parser',
+                        help='parser of the channel pages (lxml and selectolax need to be installed)')
+    common.add_argument('--restrict-parse', action='store_true',
+                        help='only build the headline and date nodes of the channel pages')
+    common.add_argument('--directory', default='.', help='directory of the excel sheets')
+    common.add_argument('--store', default='articles.db', help='SQLite article store to upsert into')
+    common.add_argument('--no-store', action='store_true', help='do not keep the articles in the store')
+    common.add_argument('--cache', default='.http_cache', help='directory of the response cache')
+    common.add_argument('--no-cache', action='store_true', help='always fetch from the network')
+    common.add_argument('--offline', action='store_true', help='only replay the response cache')
+    common.add_argument('--no-rate-limit', action='store_true', help='send the requests unthrottled')
+    common.add_argument('--metrics', help='write the run metrics to this file (.prom for Prometheus text, else json)')
+    common.add_argument('--log-level', default='INFO', help='logging level (DEBUG, INFO, WARNING)')
+
+    crawl = argparse.ArgumentParser(add_help=False)
+    crawl.add_argument('--incremental', action='store_true', help='stop paginating once the pages are older or already seen')
+    crawl.add_argument('--checkpoint', action='store_true', help='resume an interrupted crawl of the channel')
+    crawl.add_argument('--enrich', action='store_true',
+                       help='also fetch the article pages and print their author and tags (kept in the store)')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    week = commands.add_parser('week', parents=[common, crawl], help='updates of one week of a channel')
+    week.add_argument('channel')
+    week.add_argument('week_date', help='any date of the week (the week ending on the last sunday on or before it)')
+
+    range_ = commands.add_parser('range', parents=[common, crawl], help='updates of a channel between two dates')
+    range_.add_argument('channel')
+    range_.add_argument('start_date')
+    range_.add_argument('end_date')
+
+    keywords = commands.add_parser('keywords', parents=[common], help='links of channels whose text matches keywords')
+    keywords.add_argument('channels', nargs='+')
+    keywords.add_argument('--keywords', required=True, help='comma separated keywords')
+    keywords.add_argument('--match', choices=['all', 'any', 'phrase'], default='all', help='how the keywords must match')
+    keywords.add_argument('--output', help='excel sheet to write the links to')
+
+    batch = commands.add_parser('batch', parents=[common], help='run the jobs of a json manifest')
+    batch.add_argument('manifest')
+    batch.add_argument('--parallel', type=int, default=1, help='jobs run at the same time')
+    return parser
+
+def _setup(args):
+    from .fetcher import use_cache, use_rate_limiter
+    from .pages import use_host_limit, use_parser
+
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    use_host_limit(args.per_host)
+    use_parser(args.parser, args.restrict_parse)
+    if not args.no_cache:
+        from .cache import ResponseCache
+
+        use_cache(ResponseCache(args.cache, offline=args.offline))
+    if not args.no_rate_limit:
+        from .ratelimit import AdaptiveRateLimiter
+
+        use_rate_limiter(AdaptiveRateLimiter())
+    if args.no_store or args.command == 'keywords':
+        return None
+    from .store import ArticleStore
+
+    return ArticleStore(args.store)
+
+def _print_rows(rows, args, store):
+    if not args.enrich:
+        for headline, url, date in rows:
+            print(f'{date:%Y-%m-%d}\t{headline}\t{url}')
+        return
+    import pandas as pd
+
+    from .enrich import enrich_frame
+
+    df = enrich_frame(pd.DataFrame(list(rows), columns=['Headline', 'URL', 'Date']), store, max_workers=args.workers)
+    for headline, url, date, author, tags in zip(df['Headline'], df['URL'], df['Date'], df['Author'], df['Tags']):
+        author, tags = ('' if pd.isna(value) else value for value in (author, tags))
+        print(f'{date:%Y-%m-%d}\t{headline}\t{url}\t{author}\t{tags}')
+
+def _checkpoint(args, url, dates):
+    if not args.checkpoint:
+        return None
+    from .checkpoint import CrawlCheckpoint
+    from .scrape import checkpoint_path
+
+    return CrawlCheckpoint(checkpoint_path(url, args.command, dates, args.directory))
+
+def _run(args, store):
+    from .crawler import channel_url
+
+    if args.command == 'week':
+        from .scrape import extract_week
+
+        url = channel_url(args.channel)
+        _, week_updates = extract_week(url, args.week_date, xls=args.xls, workers=args.workers,
+                                       incremental=args.incremental, store=store,
+                                       checkpoint=_checkpoint(args, url, [args.week_date]), directory=args.directory)
+        if isinstance(week_updates, str):
+            logging.getLogger(__name__).info(week_updates)
+            return {'rows': 0}, 0
+        _print_rows(week_updates, args, store)
+        return {'rows': len(week_updates)}, 0
+
+    if args.command == 'range':
+        from .scrape import extract_range
+
+        url = channel_url(args.channel)
+        df = extract_range(url, args.start_date, args.end_date, xls=args.xls, workers=args.workers,
+                           incremental=args.incremental, store=store,
+                           checkpoint=_checkpoint(args, url, [args.start_date, args.end_date]),
+                           directory=args.directory)
+        _print_rows(zip(df['Headline'], df['URL'], df['Date']), args, store)
+        return {'rows': len(df)}, 0
+
+    if args.command == 'keywords':
+        from .keywords import filter_channels
+
+        df = filter_channels(args.channels, args.keywords.split(','), mode=args.match, max_workers=args.workers)
+        if len(args.channels) == 1:
+            df = df.drop(columns='Channel')
+        if args.output:
+            df.to_excel(args.output, index=False)
+        for text, link, updated in zip(df['Link Text'], df['Link URL'], df['Updated Date']):
+            print(f'{updated}\t{text}\t{link}')
+        return {'rows': len(df)}, 0
+
+    from .batch import load_manifest, run_batch
+
+    jobs = load_manifest(args.manifest)
+    for job in jobs:
+        job.setdefault('workers', args.workers)
+        job.setdefault('xls', args.xls)
+    results = run_batch(jobs, store=store, parallel=args.parallel, directory=args.directory)
+    failed = sum(result['status'] != 'ok' for result in results)
+    return {'jobs': len(results), 'failed': failed, 'rows': sum(result['rows'] for result in results)}, int(failed > 0)
+
+def _check_dates(parser, args):
+    from .scrape import resolve_date
+
+    names = {'week': ['week_date'], 'range': ['start_date', 'end_date']}.get(args.command, [])
+    for name in names:
+        try:
+            resolve_date(getattr(args, name))
+        except ValueError as e:
+            parser.error(f'argument {name}: {e}')
+
+def main(argv=None):
+    '''
+    parameters:
+        argv: command line arguments (sys.argv[1:] if None)
+    returns:
+        exit code, 0 when everything succeeded
+    '''
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # a bad date is a usage error, reported before anything is set up
+    _check_dates(parser, args)
+    store = _setup(args)
+    import requests
+
+    from .metrics import metrics
+
+    try:
+        fields, code = _run(args, store)
+    except requests.exceptions.RequestException as e:
+        logging.getLogger(__name__).error('%s failed: %s', args.command, e)
+        fields, code = {'error': str(e)}, 1
+    finally:
+        if store is not None:
+            store.close()
+    metrics.log_summary(command=args.command, **fields)
+    if args.metrics:
+        if args.metrics.endswith('.prom'):
+            metrics.write_prometheus(args.metrics)
+        else:
+            metrics.write_json(args.metrics)
+    return code
+
+if __name__ == '__main__':
+    sys.exit(main())
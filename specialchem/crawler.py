@@ -0,0 +1,82 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+
+from bs4 import BeautifulSoup
+
+from .fetcher import fetch, use_rate_limiter
+from .dates import to_frame
+from .pages import parent_url, get_total_pages, page_urls, fetch_rows
+from .ratelimit import AdaptiveRateLimiter
+from .scrape import channel_name
+
+def channel_url(channel):
+    '''
+    parameters:
+        channel: channel name (sun-care) or url
+    returns:
+        url of the channel
+    '''
+    if channel.startswith('http'):
+        return channel.rstrip('/')
+    return f'{parent_url}/channel/{channel}'
+
+def interleave(page_lists):
+    '''
+    parameters:
+        page_lists: list of page url lists, one per channel
+    returns:
+        list of (channel position, page position, url), round-robin across the channels
+    '''
+    jobs = []
+    for page_num, urls in enumerate(zip_longest(*page_lists)):
+        for channel_num, url in enumerate(urls):
+            if url is not None:
+                jobs.append((channel_num, page_num, url))
+    return jobs
+
+def _total_pages(url):
+    return get_total_pages(BeautifulSoup(fetch(url).content, 'html.parser'))
+
+def crawl_channels(channels, max_workers=8, per_host=None):
+    '''
+    Crawls several channels through one bounded worker pool. The pages of
+    the channels are queued round-robin so every channel progresses at the
+    same pace, whatever the number of pages of each one.
+
+    parameters:
+        channels: channel names (sun-care) or urls
+        max_workers: number of pages fetched at the same time across all channels
+        per_host: maximum number of requests in flight against one host (pages.host_limit if None)
+    returns:
+        dataframe of Headline, URL, Date and Channel, each URL kept once
+        (for the first channel listing it), in channel then page order
+    '''
+    urls = [channel_url(channel) for channel in channels]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        totals = list(executor.map(_total_pages, urls))
+        page_lists = [page_urls(url, total) for url, total in zip(urls, totals)]
+        jobs = interleave(page_lists)
+        results = list(executor.map(lambda job: fetch_rows(job[2], per_host), jobs))
+
+    channel_pages = [[None] * len(page_list) for page_list in page_lists]
+    for (channel_num, page_num, _), rows in zip(jobs, results):
+        channel_pages[channel_num][page_num] = rows
+
+    data = []
+    for url, pages_rows in zip(urls, channel_pages):
+        channel = channel_name(url)
+        for rows in pages_rows:
+            data += [(headline, article_url, date, channel) for headline, article_url, date in rows]
+
+    # the rows without a date are left out, logged and counted in the metrics
+    df, _ = to_frame(data, columns=('Headline', 'URL', 'Date', 'Channel'))
+    df = df.drop_duplicates(subset='URL', keep='first')
+    return df.reset_index(drop=True)
+
+if __name__ == '__main__':
+    # python -m specialchem.crawler sun-care skin-care hair-care
+    use_rate_limiter(AdaptiveRateLimiter())
+    df = crawl_channels(sys.argv[1:] or ['sun-care', 'skin-care'])
+    print(df.groupby('Channel').size())
@@ -0,0 +1,111 @@
+import logging
+import re
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from .metrics import metrics
+
+log = logging.getLogger(__name__)
+
+# first "Apr 05, 2024" in the date text of an article ("Published on Apr 05, 2024")
+date_pattern = re.compile(r'([A-Za-z]{3}) (\d{1,2}), (\d{4})')
+
+# english month names, independent of the locale unlike strptime('%b')
+month_numbers = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+@lru_cache(maxsize=65536)
+def parse_date(text):
+    '''
+    parameters:
+        text: date text of an article ("... Apr 05, 2024")
+    returns:
+        datetime of the article, or None if the text has no valid date
+    '''
+    match = date_pattern.search(text)
+    if not match:
+        return None
+    month = month_numbers.get(match.group(1).lower())
+    if month is None:
+        return None
+    try:
+        return datetime(int(match.group(3)), month, int(match.group(2)))
+    except ValueError:
+        # Feb 30, Apr 31, ...
+        return None
+
+def parse_dates(texts):
+    '''
+    Parses a column of date texts, each distinct text only once.
+
+    parameters:
+        texts: date texts of the articles
+    returns:
+        datetime64[ns] array (NaT where the text has no valid date)
+    '''
+    import pandas as pd
+
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=True)
+    parsed = np.array([parse_date(text) if isinstance(text, str) else None for text in uniques] + [None],
+                      dtype='datetime64[ns]')
+    # the -1 code of missing texts points at the trailing NaT
+    return parsed[codes]
+
+def as_datetimes(column):
+    '''
+    parameters:
+        column: Date column, either datetimes or date texts (as read back from Excel)
+    returns:
+        the column as datetime64, parsing it only if it holds texts
+    '''
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    return pd.Series(parse_dates(column.to_numpy()), index=column.index, name=column.name)
+
+def _report_failures(failed, total):
+    metrics.inc('date_failures_total', len(failed))
+    if failed:
+        log.warning('%d of %d rows have no parsable date, first: %r', len(failed), total, failed[0])
+
+def date_rows(rows):
+    '''
+    parameters:
+        rows: (Headline, URL, date text) tuples as parsed from one channel page
+    returns:
+        list of (Headline, URL, datetime) tuples, the rows whose date could not be
+        parsed are left out, logged and counted like in to_frame
+    '''
+    dated, failed = [], []
+    for headline, url, text in rows:
+        date = parse_date(text) if isinstance(text, str) else None
+        if date is None:
+            failed.append((headline, url, text))
+        else:
+            dated.append((headline, url, date))
+    _report_failures(failed, len(rows))
+    return dated
+
+def to_frame(rows, columns=('Headline', 'URL', 'Date')):
+    '''
+    parameters:
+        rows: (Headline, URL, date text, ...) tuples as parsed from the channel pages
+        columns: names of the columns, the third one holding the date texts
+    returns:
+        dataframe of the rows with a datetime Date column, and the rows whose
+        date could not be parsed (left out of the dataframe)
+    '''
+    import pandas as pd
+
+    rows = list(rows)
+    df = pd.DataFrame(rows, columns=list(columns))
+    dates = parse_dates(df[columns[2]].to_numpy())
+    valid = ~np.isnat(dates)
+    # taken from rows, the frame turns a missing date text into nan on pandas 3
+    failed = [tuple(rows[index]) for index in np.flatnonzero(~valid)]
+    _report_failures(failed, len(df))
+    df[columns[2]] = dates
+    return df[valid], failed
@@ -0,0 +1,130 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+
+from .fetcher import fetch
+from .pipeline import iter_chunks
+
+log = logging.getLogger(__name__)
+
+def _meta(soup, **attrs):
+    return [tag['content'].strip() for tag in soup.find_all('meta', attrs=attrs) if tag.get('content')]
+
+def parse_article(content):
+    '''
+    parameters:
+        content: html of an article page
+    returns:
+        dict with the Body text, Author (None if not found) and Tags (list) of the article
+    '''
+    soup = BeautifulSoup(content, 'html.parser')
+
+    body = soup.find('article') or soup.find(attrs={'itemprop': 'articleBody'}) or soup.find('main') or soup.body
+    for tag in body.find_all(['script', 'style']) if body else []:
+        tag.decompose()
+    body_text = body.get_text(' ', strip=True) if body else ''
+
+    authors = _meta(soup, name='author') or _meta(soup, property='article:author')
+    if not authors:
+        author_tag = soup.find(class_='author') or soup.find(attrs={'rel': 'author'})
+        authors = [author_tag.get_text(strip=True)] if author_tag else []
+
+    tags = _meta(soup, property='article:tag')
+    for keywords in _meta(soup, name='keywords'):
+        tags += [keyword.strip() for keyword in keywords.split(',') if keyword.strip()]
+    # keep the first occurrence of every tag, in page order
+    tags = list(dict.fromkeys(tags))
+
+    return {'Body': body_text, 'Author': authors[0] if authors else None, 'Tags': tags}
+
+def _enrich_one(url):
+    start = time.perf_counter()
+    try:
+        response = fetch(url)
+        # fetch returns the 4xx responses, which are not articles
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        # left out of the store, so the next run tries it again
+        log.warning('could not enrich %s: %s', url, e)
+        return None, time.perf_counter() - start
+    try:
+        record = parse_article(response.content)
+    except Exception:
+        # one malformed page must not abort the whole batch
+        log.warning('could not parse the article %s', url, exc_info=True)
+        return None, time.perf_counter() - start
+    record['URL'] = url
+    return record, time.perf_counter() - start
+
+def enrich(urls, store=None, max_workers=8, batch_size=50, on_batch=None):
+    '''
+    Fetches the article pages in batches through a bounded thread pool and
+    yields their details as soon as every batch is done.
+
+    parameters:
+        urls: article urls, as produced by extract_data
+        store: ArticleStore used to skip the urls enriched by previous runs and to save the new ones
+        max_workers: number of article pages fetched at the same time
+        batch_size: number of articles per batch
+        on_batch: function called with the throughput and latency report of every batch
+    returns:
+        iterator of dicts with the URL, Body, Author and Tags of every new article
+    '''
+    done = store.enriched_urls() if store is not None else set()
+    # drop the urls already enriched and the duplicates, keeping the order
+    pending = [url for url in dict.fromkeys(urls) if url not in done]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_num, batch in enumerate(iter_chunks(pending, batch_size), start=1):
+            start = time.perf_counter()
+            results = list(executor.map(_enrich_one, batch))
+            elapsed = time.perf_counter() - start
+
+            records = [record for record, _ in results if record is not None]
+            latencies = sorted(latency for _, latency in results)
+            if store is not None:
+                store.add_enrichments(records)
+
+            report = {
+                'batch': batch_num,
+                'articles': len(records),
+                'failed': len(batch) - len(records),
+                'seconds': elapsed,
+                'articles_per_second': len(records) / elapsed if elapsed else 0.0,
+                'mean_latency': sum(latencies) / len(latencies),
+                'p95_latency': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max_latency': latencies[-1],
+            }
+            log.info('enrichment batch %(batch)d: %(articles)d articles (%(failed)d failed) in %(seconds).2fs '
+                     '(%(articles_per_second).1f/s, mean %(mean_latency).3fs, p95 %(p95_latency).3fs)', report)
+            if on_batch is not None:
+                on_batch(report)
+
+            yield from records
+
+def enrich_frame(df, store, max_workers=8, batch_size=50, on_batch=None):
+    '''
+    parameters:
+        df: dataframe with an URL column, as returned by extract_data
+        store: ArticleStore holding the enrichments of the previous runs (None to fetch
+            every article and only keep them in the returned dataframe)
+        max_workers: number of article pages fetched at the same time
+        batch_size: number of articles per batch
+        on_batch: function called with the throughput and latency report of every batch
+    returns:
+        df with the Body, Author and Tags (comma separated) columns of every article,
+        empty for the articles that could not be enriched
+    '''
+    records = list(enrich(df['URL'], store, max_workers, batch_size, on_batch))
+    if store is not None:
+        return df.merge(store.enrichments(), on='URL', how='left')
+
+    import pandas as pd
+
+    # same columns as ArticleStore.enrichments
+    enriched = pd.DataFrame([{**record, 'Tags': ','.join(record['Tags'])} for record in records],
+                            columns=['URL', 'Body', 'Author', 'Tags'])
+    return df.merge(enriched, on='URL', how='left')
@@ -0,0 +1,183 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import OfflineCacheMiss
+from .metrics import metrics
+from .ratelimit import retry_after, throttle_statuses
+
+log = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds
+timeout = (5, 30)
+retry_statuses = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+_limiter = None
+
+class FetchStats:
+    '''
+    Collects the latency and retry count of every request made through fetch
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def add(self, url, status, latency, retries):
+        with self._lock:
+            self.records.append((url, status, latency, retries))
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+
+    def summary(self):
+        '''
+        returns:
+            dict with the number of requests, retries and the total, mean and max latency
+        '''
+        with self._lock:
+            latencies = [record[2] for record in self.records]
+            retries = sum(record[3] for record in self.records)
+        if not latencies:
+            return {'requests': 0, 'retries': 0, 'total_latency': 0.0, 'mean_latency': 0.0, 'max_latency': 0.0}
+        return {
+            'requests': len(latencies),
+            'retries': retries,
+            'total_latency': sum(latencies),
+            'mean_latency': sum(latencies) / len(latencies),
+            'max_latency': max(latencies),
+        }
+
+stats = FetchStats()
+
+def get_session(pool_size=16):
+    '''
+    parameters:
+        pool_size: number of keep-alive connections kept open per host
+    returns:
+        the shared requests session, created on first use
+    '''
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+def use_cache(response_cache):
+    '''
+    parameters:
+        response_cache: ResponseCache every fetch goes through, or None to disable caching
+    '''
+    global _cache
+    _cache = response_cache
+
+def use_rate_limiter(rate_limiter):
+    '''
+    parameters:
+        rate_limiter: AdaptiveRateLimiter every request waits on, or None to send requests unthrottled
+    '''
+    global _limiter
+    _limiter = rate_limiter
+
+def get_rate_limiter():
+    '''
+    returns:
+        the rate limiter set with use_rate_limiter, or None
+    '''
+    return _limiter
+
+def backoff_delay(attempt, backoff):
+    # exponential backoff with full jitter on top
+    return backoff * (2 ** attempt) + random.uniform(0, backoff)
+
+def fetch(url, retries=3, backoff=0.5):
+    '''
+    parameters:
+        url: url to request
+        retries: number of times a timeout, connection error, 429 or 5xx is retried
+        backoff: base delay in seconds between two attempts (or the Retry-After delay if longer)
+    returns:
+        response of the request (served from the response cache when one is in use)
+    '''
+    response_cache = _cache
+    if response_cache is None:
+        return _get(url, {}, retries, backoff)
+
+    entry = response_cache.get(url)
+    if response_cache.offline:
+        if entry is None:
+            raise OfflineCacheMiss(f'{url} is not in the response cache')
+        metrics.inc('cache_hits_total')
+        return response_cache.to_response(url, entry)
+    if entry is not None and response_cache.is_fresh(entry):
+        metrics.inc('cache_hits_total')
+        return response_cache.to_response(url, entry)
+
+    headers = response_cache.conditional_headers(entry) if entry is not None else {}
+    response = _get(url, headers, retries, backoff)
+    if response.status_code == 304 and entry is not None:
+        metrics.inc('cache_revalidated_total')
+        response_cache.refresh(url, entry)
+        return response_cache.to_response(url, entry)
+    if response.status_code == 200:
+        response_cache.put(url, response)
+    return response
+
+def _get(url, headers, retries, backoff):
+    session = get_session()
+    limiter = _limiter
+    attempt = 0
+    start = time.perf_counter()
+
+    while True:
+        delay = backoff_delay(attempt, backoff)
+        if limiter is not None:
+            waited = time.perf_counter()
+            limiter.acquire()
+            # the latency is the time spent on the requests, not waiting for the limiter
+            start += time.perf_counter() - waited
+        sent = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if limiter is not None:
+                limiter.on_error()
+            if attempt >= retries:
+                stats.add(url, None, time.perf_counter() - start, attempt)
+                metrics.record_request(None, time.perf_counter() - start, attempt, 0)
+                raise
+            log.warning('%s failed (%s), retrying', url, e)
+        else:
+            wait = retry_after(response.headers.get('Retry-After'))
+            if limiter is not None:
+                limiter.on_response(response.status_code, time.perf_counter() - sent, wait)
+            if response.status_code in throttle_statuses:
+                metrics.inc('throttled_total')
+            if response.status_code not in retry_statuses:
+                break
+            if attempt >= retries:
+                stats.add(url, response.status_code, time.perf_counter() - start, attempt)
+                metrics.record_request(response.status_code, time.perf_counter() - start, attempt, len(response.content))
+                response.raise_for_status()
+            log.warning('%s returned %s, retrying', url, response.status_code)
+            if wait is not None:
+                delay = max(delay, wait)
+        time.sleep(delay)
+        attempt += 1
+
+    latency = time.perf_counter() - start
+    stats.add(url, response.status_code, latency, attempt)
+    metrics.record_request(response.status_code, latency, attempt, len(response.content))
+    log.debug('GET %s %s in %.3fs (%d retries)', url, response.status_code, latency, attempt)
+    return response
@@ -0,0 +1,115 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from .crawler import channel_url
+from .fetcher import fetch
+from .pages import get_total_pages, page_urls
+from .scrape import channel_name
+
+class KeywordMatcher:
+    '''
+    Keyword filter compiled once into a single regular expression.
+
+    modes:
+        all: every keyword appears in the text
+        any: at least one keyword appears in the text
+        phrase: the keywords appear in order as one phrase (any whitespace between them)
+    Matching is case-insensitive; with no keyword every text matches.
+    '''
+    def __init__(self, keywords, mode='all'):
+        if mode not in ('all', 'any', 'phrase'):
+            raise ValueError(f'unknown keyword mode {mode!r}')
+        self.keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip()]
+        self.mode = mode
+        escaped = [re.escape(keyword) for keyword in self.keywords]
+        if not escaped:
+            self.pattern = None
+        elif mode == 'all':
+            # one lookahead per keyword, each scans the text independently
+            self.pattern = re.compile(''.join(f'(?=.*?{keyword})' for keyword in escaped), re.DOTALL)
+        elif mode == 'any':
+            self.pattern = re.compile('|'.join(escaped))
+        else:
+            self.pattern = re.compile(r'\s+'.join(escaped))
+
+    def matches(self, text):
+        '''
+        parameters:
+            text: text to test
+        returns:
+            True if the text matches the keywords
+        '''
+        if self.pattern is None:
+            return True
+        if self.mode == 'all':
+            return self.pattern.match(text.lower()) is not None
+        return self.pattern.search(text.lower()) is not None
+
+def _is_updated_date(tag):
+    return tag.name == 'span' and 'updated-date' in (tag.get('class') or [])
+
+def filter_links(soup, url, matcher):
+    '''
+    Finds the links whose text matches, with the nearest "updated-date" span
+    before each of them, in a single forward pass over the document.
+
+    parameters:
+        soup: parsed page
+        url: url of the page, to resolve the relative links
+        matcher: KeywordMatcher to apply to the link texts
+    returns:
+        list of (link text, link url, updated date) tuples, "N/A" when no date precedes the link
+    '''
+    results = []
+    updated_date = 'N/A'
+    # find_all walks the tree in document order, the same order find_previous walks back
+    for tag in soup.find_all(['a', 'span']):
+        if tag.name == 'span':
+            if _is_updated_date(tag):
+                updated_date = tag.text.strip()
+            continue
+        if tag.get('href'):
+            link_text = tag.text.strip()
+            if matcher.matches(link_text):
+                results.append((link_text, urljoin(url, tag.get('href')), updated_date))
+    return results
+
+def _total_pages(url):
+    response = fetch(url)
+    response.raise_for_status()  # Raise an exception for non-2xx status codes
+    return get_total_pages(BeautifulSoup(response.content, 'html.parser'))
+
+def _filter_page(page_url, matcher):
+    soup = BeautifulSoup(fetch(page_url).content, 'html.parser')
+    return filter_links(soup, page_url, matcher)
+
+def filter_channels(channels, keywords, mode='all', max_workers=8):
+    '''
+    parameters:
+        channels: channel names (sun-care) or urls
+        keywords: keywords to look for in the link texts
+        mode: 'all', 'any' or 'phrase' (see KeywordMatcher)
+        max_workers: number of pages fetched at the same time
+    returns:
+        dataframe of Link Text, Link URL, Updated Date and Channel over every page
+        of every channel, each link URL kept once
+    '''
+    matcher = KeywordMatcher(keywords, mode)
+    urls = [channel_url(channel) for channel in channels]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        totals = list(executor.map(_total_pages, urls))
+        jobs = [(channel_name(url), page_url) for url, total in zip(urls, totals) for page_url in page_urls(url, total)]
+        results = list(executor.map(lambda job: _filter_page(job[1], matcher), jobs))
+
+    data = []
+    for (channel, _), links in zip(jobs, results):
+        data += [link + (channel,) for link in links]
+
+    df = pd.DataFrame(data, columns=['Link Text', 'Link URL', 'Updated Date', 'Channel'])
+    df.drop_duplicates(subset='Link URL', keep='first', inplace=True)
+    return df.reset_index(drop=True)
@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+# upper bounds in seconds (or rows) of the histogram buckets
+latency_buckets = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+rows_buckets = (0, 5, 10, 20, 50, 100, 200)
+
+class Histogram:
+    '''
+    Cumulative histogram with fixed buckets, like the Prometheus ones
+    '''
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        '''
+        returns:
+            upper bound of the bucket holding the q quantile (max if it is above every bucket)
+        '''
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max,
+            'buckets': dict(zip(map(str, self.buckets), self.counts)),
+        }
+
+class Metrics:
+    '''
+    Counters and histograms of a scraping run.
+
+    fetcher records the requests (count, bytes, latency, retries, cache hits),
+    pages records the parsing (time, rows per page) and the scripts time their
+    own stages with stage(). The values can be logged, written as JSON or
+    Prometheus text, or served over HTTP.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters = {}
+            self.histograms = {}
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value, buckets=latency_buckets):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(buckets)
+            self.histograms[name].observe(value)
+
+    def record_request(self, status, latency, retries, size):
+        '''
+        parameters:
+            status: final status code of the request (None when it never got a response)
+            latency: seconds spent on the request, retries included
+            retries: number of retries made
+            size: bytes of the response body
+        '''
+        self.inc('requests_total')
+        self.inc('retries_total', retries)
+        self.inc('response_bytes_total', size)
+        self.observe('request_latency_seconds', latency)
+        if status is None or status >= 400:
+            self.inc('request_errors_total')
+
+    def record_page(self, rows):
+        '''
+        parameters:
+            rows: number of rows parsed from a channel page
+        '''
+        self.inc('pages_total')
+        self.inc('rows_total', rows)
+        self.observe('rows_per_page', rows, rows_buckets)
+
+    @contextmanager
+    def stage(self, name):
+        '''
+        Times the block into the <name>_seconds histogram
+        '''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f'{name}_seconds', time.perf_counter() - start)
+
+    def snapshot(self):
+        '''
+        returns:
+            dict with the counters, the histograms and the run rates
+        '''
+        with self._lock:
+            elapsed = time.time() - self.started
+            counters = dict(self.counters)
+            histograms = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        pages = counters.get('pages_total', 0)
+        return {
+            'elapsed_seconds': elapsed,
+            'pages_per_second': pages / elapsed if elapsed else 0.0,
+            'rows_per_page': counters.get('rows_total', 0) / pages if pages else 0.0,
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def to_prometheus(self, prefix='scraper_'):
+        '''
+        returns:
+            the metrics in the Prometheus text exposition format
+        '''
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {prefix}{name} counter')
+                lines.append(f'{prefix}{name} {value}')
+            for name, histogram in sorted(self.histograms.items()):
+                lines.append(f'# TYPE {prefix}{name} histogram')
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{prefix}{name}_bucket{{le="{bound}"}} {count}')
+                lines.append(f'{prefix}{name}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f'{prefix}{name}_sum {histogram.sum}')
+                lines.append(f'{prefix}{name}_count {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def write_prometheus(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+    def summary(self, **fields):
+        '''
+        parameters:
+            fields: extra values describing the run (channel, rows, ...)
+        returns:
+            flat dict summarizing the run
+        '''
+        snapshot = self.snapshot()
+        counters = snapshot['counters']
+        histograms = snapshot['histograms']
+        latency = histograms.get('request_latency_seconds', {})
+        summary = dict(fields)
+        summary.update({
+            'requests': counters.get('requests_total', 0),
+            'retries': counters.get('retries_total', 0),
+            'request_errors': counters.get('request_errors_total', 0),
+            'cache_hits': counters.get('cache_hits_total', 0),
+            'bytes': counters.get('response_bytes_total', 0),
+            'latency_p50': latency.get('p50'),
+            'latency_p95': latency.get('p95'),
+            'pages': counters.get('pages_total', 0),
+            'pages_per_second': round(snapshot['pages_per_second'], 3),
+            'rows_per_page': round(snapshot['rows_per_page'], 2),
+            'elapsed_seconds': round(snapshot['elapsed_seconds'], 3),
+        })
+        for name, histogram in histograms.items():
+            if name.endswith('_seconds') and name != 'request_latency_seconds':
+                summary[name] = round(histogram['sum'], 4)
+        return summary
+
+    def log_summary(self, **fields):
+        '''
+        Logs the run summary as one JSON line and returns it
+        '''
+        summary = self.summary(**fields)
+        log.info('run summary %s', json.dumps(summary, default=str))
+        return summary
+
+    def serve(self, port=9108, host='127.0.0.1'):
+        '''
+        Serves /metrics (Prometheus text) and /metrics.json from a background thread
+        returns:
+            the server, call shutdown() to stop it
+        '''
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.to_prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+metrics = Metrics()
@@ -0,0 +1,274 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .dates import parse_date
+from .fetcher import fetch
+from .metrics import metrics
+
+parent_url = 'https://cosmetics.specialchem.com'
+headline_class = 'titre float'
+date_class = 'date float dotted_line c5'
+
+# parser used for the channel pages: 'html.parser', 'lxml' or 'selectolax'
+parser_backend = 'html.parser'
+# True to only build the headline and date nodes instead of the whole page
+restrict_parse = False
+# maximum number of page requests in flight against one host, across every caller
+host_limit = 4
+
+_host_locks = {}
+_host_locks_guard = threading.Lock()
+
+def get_total_pages(soup):
+    '''
+    parameters:
+        soup: parsed first page of the channel
+    returns:
+        number of pages in the channel pagination (1 if there is none)
+    '''
+    pagination = soup.find('div', class_='products-pagination')
+    total_pages = 1
+
+    if pagination:
+        pages = pagination.find_all('a')
+        if pages:
+            total_pages = int(pages[-2].text)
+    return total_pages
+
+def page_urls(url, total_pages):
+    '''
+    parameters:
+        url: url of the channel
+        total_pages: number of pages in the channel
+    returns:
+        list of the paginated urls, in page order
+    '''
+    return [f'{url}?indexpage={page_num}' for page_num in range(1, total_pages + 1)]
+
+def use_parser(backend='html.parser', restrict=False):
+    '''
+    parameters:
+        backend: 'html.parser', 'lxml' or 'selectolax' (lxml and selectolax need to be installed)
+        restrict: True to only build the headline and date nodes of the pages
+    '''
+    global parser_backend, restrict_parse
+    if backend not in ('html.parser', 'lxml', 'selectolax'):
+        raise ValueError(f'unknown parser backend {backend!r}')
+    parser_backend = backend
+    restrict_parse = restrict
+
+def use_host_limit(limit=4):
+    '''
+    parameters:
+        limit: maximum number of page requests in flight against one host, whatever
+            the number of workers (to set before the pages are fetched)
+    '''
+    global host_limit
+    if limit < 1:
+        raise ValueError(f'host limit must be at least 1, not {limit}')
+    with _host_locks_guard:
+        host_limit = limit
+        _host_locks.clear()
+
+def _is_wanted(class_value):
+    # the strainer sees the raw class attribute, find_all then applies the exact match
+    return class_value is not None and not {'titre', 'dotted_line'}.isdisjoint(class_value.split())
+
+_strainer = SoupStrainer(class_=_is_wanted)
+
+def _parse_soup(content, backend, restrict):
+    page_soup = BeautifulSoup(content, backend, parse_only=_strainer if restrict else None)
+
+    headlines = page_soup.find_all(class_=headline_class)
+    dates = page_soup.find_all(class_=date_class)
+
+    headlines_text = [headline.get_text(strip=True) for headline in headlines]
+    dates_text = [date.get_text(strip=True) for date in dates]
+    urls = [parent_url + headline['href'] for headline in headlines]
+
+    return list(zip(headlines_text, urls, dates_text))
+
+def _parse_selectolax(content):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+
+    def find_all(class_name):
+        # same matching as BeautifulSoup: the whole class attribute equals class_name
+        return [node for node in tree.css('.' + class_name.replace(' ', '.'))
+                if ' '.join((node.attributes.get('class') or '').split()) == class_name]
+
+    headlines = find_all(headline_class)
+    dates = find_all(date_class)
+
+    headlines_text = [headline.text(separator='', strip=True) for headline in headlines]
+    dates_text = [date.text(separator='', strip=True) for date in dates]
+    urls = [parent_url + headline.attributes['href'] for headline in headlines]
+
+    return list(zip(headlines_text, urls, dates_text))
+
+def parse_page(content, backend=None, restrict=None):
+    '''
+    parameters:
+        content: html of one channel page
+        backend: parser to use, defaults to the one set with use_parser
+        restrict: True to only build the nodes needed, defaults to the use_parser setting
+    returns:
+        list of (Headline, URL, Date) tuples found on the page
+    '''
+    backend = parser_backend if backend is None else backend
+    restrict = restrict_parse if restrict is None else restrict
+    if backend == 'selectolax':
+        return _parse_selectolax(content)
+    return _parse_soup(content, backend, restrict)
+
+def check_parity(contents, backend, restrict=True):
+    '''
+    parameters:
+        contents: html of saved channel pages
+        backend: parser backend to compare against html.parser
+        restrict: True to compare the restricted parse
+    returns:
+        indexes of the pages where the (Headline, URL, Date) tuples differ from html.parser
+    '''
+    return [index for index, content in enumerate(contents)
+            if parse_page(content, backend, restrict) != _parse_soup(content, 'html.parser', False)]
+
+def _host_lock(url, per_host=None):
+    # one semaphore per host shared by every caller, so the politeness limit
+    # holds whatever the number of pools fetching from the host
+    limit = host_limit if per_host is None else per_host
+    host = urlparse(url).netloc
+    with _host_locks_guard:
+        if host not in _host_locks:
+            _host_locks[host] = (threading.BoundedSemaphore(limit), limit)
+        semaphore, current = _host_locks[host]
+    if limit != current:
+        raise ValueError(f'{host} is already limited to {current} requests in flight, not {limit}')
+    return semaphore
+
+def fetch_rows(page_url, per_host=None):
+    '''
+    parameters:
+        page_url: url of one channel page
+        per_host: maximum number of requests in flight against one host (host_limit if None),
+            a host keeps the limit it was first fetched with
+    returns:
+        list of (Headline, URL, Date) tuples found on the page
+    '''
+    with _host_lock(page_url, per_host):
+        page_response = fetch(page_url)
+    with metrics.stage('parse'):
+        rows = parse_page(page_response.content)
+    metrics.record_page(len(rows))
+    return rows
+
+def fetch_pages(urls, max_workers=1, per_host=None, checkpoint=None):
+    '''
+    parameters:
+        urls: page urls to fetch
+        max_workers: number of pages fetched at the same time (1 fetches serially),
+            of which at most per_host are requests in flight against one host
+        per_host: maximum number of requests in flight against one host (host_limit if None)
+        checkpoint: started CrawlCheckpoint whose pages are reused instead of fetched,
+            and that records every page fetched (None to skip)
+    returns:
+        list with the rows of every page, in the same order as urls
+    '''
+    def fetch_one(page_url):
+        if checkpoint is None:
+            return fetch_rows(page_url, per_host)
+        rows = checkpoint.pages.get(page_url)
+        if rows is None:
+            rows = fetch_rows(page_url, per_host)
+            checkpoint.record(page_url, rows)
+        return rows
+
+    if max_workers <= 1:
+        return [fetch_one(page_url) for page_url in urls]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map keeps the input order, so the rows come back in page order
+        return list(executor.map(fetch_one, urls))
+
+def week_first_day(week_date):
+    '''
+    parameters:
+        week_date: datetime of the requested week
+    returns:
+        first day (monday) of the week picked for week_date by weekly_data,
+        i.e. the week ending on the last sunday on or before week_date
+    '''
+    week_end = week_date - timedelta(days=(week_date.weekday() + 1) % 7)
+    return week_end - timedelta(days=6)
+
+def crawl_incremental(url, total_pages, start_date, seen, max_workers=1, checkpoint=None):
+    '''
+    Walks the channel pages newest-first and stops as soon as a page is
+    entirely older than start_date, or only holds already seen articles
+    while everything since start_date is already known.
+
+    parameters:
+        url: url of the channel
+        total_pages: number of pages in the channel
+        start_date: datetime of the oldest article needed
+        seen: SeenStore with the articles of the previous runs
+        max_workers: maximum number of pages fetched at the same time (the first page
+            is fetched alone, the next windows double up to max_workers)
+        checkpoint: started CrawlCheckpoint to resume the pages from (None to skip)
+    returns:
+        list of (Headline, URL, Date) tuples from the fetched pages, followed by
+        the already seen articles on or after start_date that were not refetched
+    '''
+    known = seen.articles(url)
+    covered_since = seen.covered_since(url)
+    can_stop_on_known = covered_since is not None and covered_since <= start_date
+    urls = page_urls(url, total_pages)
+
+    data = []
+    oldest = None
+    fetched_pages = 0
+    done = False
+    # a repeat run usually stops on the first page, so the window of pages
+    # fetched at once starts at one page and doubles up to max_workers
+    first, window = 0, 1
+    while first < len(urls):
+        for rows in fetch_pages(urls[first:first + window], max_workers=max_workers, checkpoint=checkpoint):
+            data += rows
+            fetched_pages += 1
+            dates = [date for date in (parse_date(row[2]) for row in rows) if date]
+            if dates:
+                oldest = min(dates) if oldest is None else min(oldest, *dates)
+            done = (not rows
+                    or (dates and max(dates) < start_date)
+                    or (can_stop_on_known and all(row[1] in known for row in rows)))
+            if done:
+                break
+        if done:
+            break
+        first += window
+        window = min(window * 2, max(max_workers, 1))
+
+    # the fetched pages are contiguous from the newest article down to oldest,
+    # but unless the last page was reached the next page can still hold
+    # articles of the oldest day, so only the days after it are fully known
+    if oldest is not None and fetched_pages < len(urls):
+        oldest += timedelta(days=1)
+    # when they reach into the previously covered span the two spans merge
+    joined = covered_since is not None and any(
+        row[1] in known and (parse_date(known[row[1]][1]) or start_date) >= covered_since for row in data)
+    if joined:
+        oldest = covered_since if oldest is None else min(oldest, covered_since)
+    seen.add(url, data, covered_since=oldest)
+    seen.save()
+
+    fetched = {row[1] for row in data}
+    for article_url, (headline, date) in known.items():
+        article_date = parse_date(date)
+        if article_url not in fetched and article_date and article_date >= start_date:
+            data.append((headline, article_url, date))
+    return data
@@ -0,0 +1,151 @@
+import csv
+from datetime import timedelta
+from itertools import islice
+
+from bs4 import BeautifulSoup
+
+from .fetcher import fetch
+from .dates import date_rows
+from .pages import get_total_pages, page_urls, fetch_pages, week_first_day
+
+columns = ['Headline', 'URL', 'Date']
+
+def iter_records(url, start_date=None, end_date=None, max_workers=1):
+    '''
+    Yields the articles of a channel page by page, newest first, with their
+    date already parsed. Articles without a date or outside [start_date, end_date]
+    are skipped, and the pagination stops at the first page entirely older
+    than start_date.
+
+    parameters:
+        url: url of the channel
+        start_date: datetime of the oldest article wanted (None for no limit)
+        end_date: datetime of the newest article wanted (None for no limit)
+        max_workers: number of pages fetched at the same time
+    returns:
+        iterator of (Headline, URL, Date) tuples
+    '''
+    soup = BeautifulSoup(fetch(url).content, 'html.parser')
+    urls = page_urls(url, get_total_pages(soup))
+    step = max(max_workers, 1)
+
+    for first in range(0, len(urls), step):
+        for rows in fetch_pages(urls[first:first + step], max_workers=max_workers):
+            newest = None
+            # the rows without a date are left out, logged and counted in the metrics
+            for headline, article_url, date in date_rows(rows):
+                newest = date if newest is None else max(newest, date)
+                if start_date is not None and date < start_date:
+                    continue
+                if end_date is not None and date > end_date:
+                    continue
+                yield (headline, article_url, date)
+            if not rows or (start_date is not None and newest is not None and newest < start_date):
+                return
+
+def iter_week_records(url, week_date, max_workers=1):
+    '''
+    parameters:
+        url: url of the channel
+        week_date: datetime of the week, picked the same way as weekly_data
+        max_workers: number of pages fetched at the same time
+    returns:
+        iterator of the (Headline, URL, Date) tuples of that week
+    '''
+    start_date = week_first_day(week_date)
+    return iter_records(url, start_date, start_date + timedelta(days=6), max_workers)
+
+def iter_chunks(records, chunksize=1000):
+    '''
+    parameters:
+        records: iterator of (Headline, URL, Date) tuples
+        chunksize: number of records per chunk
+    returns:
+        iterator of lists of at most chunksize records
+    '''
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def to_dataframe(records, chunksize=1000):
+    '''
+    parameters:
+        records: iterator of (Headline, URL, Date) tuples
+        chunksize: number of records turned into a frame at once
+    returns:
+        dataframe of the records with a datetime Date column
+    '''
+    import pandas as pd
+
+    frames = [pd.DataFrame(chunk, columns=columns) for chunk in iter_chunks(records, chunksize)]
+    if not frames:
+        return pd.DataFrame(columns=columns).astype({'Date': 'datetime64[ns]'})
+    return pd.concat(frames, ignore_index=True)
+
+def _formatted(chunk):
+    return [(headline, url, date.strftime(r'%b %d, %Y')) for headline, url, date in chunk]
+
+def write_csv(records, path, chunksize=1000):
+    '''
+    parameters:
+        records: iterator of (Headline, URL, Date) tuples
+        path: csv file to write
+        chunksize: number of records written at once
+    returns:
+        number of records written
+    '''
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for chunk in iter_chunks(records, chunksize):
+            writer.writerows(_formatted(chunk))
+            count += len(chunk)
+    return count
+
+def write_excel(records, path, chunksize=1000):
+    '''
+    parameters:
+        records: iterator of (Headline, URL, Date) tuples
+        path: xlsx file to write, with the dates in the %b %d, %Y format read by weekly_data
+        chunksize: number of records written at once
+    returns:
+        number of records written
+    '''
+    from openpyxl import Workbook
+
+    # write-only workbooks stream the rows to disk instead of keeping every cell
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    count = 0
+    for chunk in iter_chunks(records, chunksize):
+        for row in _formatted(chunk):
+            sheet.append(row)
+        count += len(chunk)
+    workbook.save(path)
+    return count
+
+def write_parquet(records, path, chunksize=10000):
+    '''
+    parameters:
+        records: iterator of (Headline, URL, Date) tuples
+        path: parquet file to write, one row group per chunk
+        chunksize: number of records written at once
+    returns:
+        number of records written
+    '''
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([('Headline', pa.string()), ('URL', pa.string()), ('Date', pa.timestamp('us'))])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_chunks(records, chunksize):
+            headlines, urls, dates = zip(*chunk)
+            writer.write_table(pa.table([list(headlines), list(urls), list(dates)], schema=schema))
+            count += len(chunk)
+    return count
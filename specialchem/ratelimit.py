@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger(__name__)
+
+# statuses telling the client to slow down
+throttle_statuses = {429, 503}
+
+def retry_after(value, now=None):
+    '''
+    parameters:
+        value: Retry-After header (seconds or an HTTP date), or None
+        now: current datetime, for the HTTP date form
+    returns:
+        seconds to wait, or None if the header is missing or invalid
+    '''
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+class AdaptiveRateLimiter:
+    '''
+    Token bucket shared by every request, whose rate adapts to the server
+    with additive increase / multiplicative decrease.
+
+    Each healthy response (fast enough, not throttled) adds increase / rate
+    requests per second, so the rate grows by about increase every second.
+    A 429 or 503, a connection error or a response slower than
+    latency_target multiplies the rate by decrease, at most once per
+    cooldown seconds so a burst of failures from the requests already in
+    flight only counts once. A Retry-After header also pauses every request
+    until it expires.
+    '''
+    def __init__(self, rate=4.0, min_rate=0.2, max_rate=20.0, burst=2, increase=1.0, decrease=0.5,
+                 latency_target=2.0, cooldown=1.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+
+    def reserve(self):
+        '''
+        Takes a token, possibly ahead of time
+        returns:
+            seconds to wait before sending the request
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # a negative balance is the queue of requests waiting for their token
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        '''
+        Blocks until the request may be sent
+        '''
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        '''
+        Waits without blocking the event loop until the request may be sent
+        '''
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _slow_down(self, now, reason):
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        rate = max(self.min_rate, self.rate * self.decrease)
+        log.info('%s, rate %.2f -> %.2f req/s', reason, self.rate, rate)
+        self.rate = rate
+
+    def on_response(self, status, latency, retry_after_seconds=None):
+        '''
+        parameters:
+            status: status code of the response
+            latency: seconds the request took
+            retry_after_seconds: delay asked by a Retry-After header, if any
+        '''
+        with self._lock:
+            now = time.monotonic()
+            if retry_after_seconds is not None and status in throttle_statuses:
+                self._paused_until = max(self._paused_until, now + retry_after_seconds)
+            if status in throttle_statuses:
+                self._slow_down(now, f'throttled ({status})')
+            elif latency > self.latency_target:
+                self._slow_down(now, f'slow response ({latency:.2f}s)')
+            elif status < 500:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_error(self):
+        '''
+        Records a connection error or a timeout
+        '''
+        with self._lock:
+            self._slow_down(time.monotonic(), 'request failed')
@@ -0,0 +1,240 @@
+'''
+Week and range extraction of a channel, shared by the CLI, the batch runner
+and the scripts. pandas, bs4 and the helper modules are only imported when
+a function runs, so importing the package stays fast.
+'''
+import os
+import re
+from datetime import datetime, timedelta
+
+columns = ['Headline', 'URL', 'Date']
+
+relative_date = re.compile(r'today(?:-(\d+))?')
+
+def resolve_date(value):
+    '''
+    parameters:
+        value: date as %Y-%m-%d, 'today', or 'today-N' for N days ago (datetimes pass through)
+    returns:
+        datetime of the date, ValueError if the value is none of these
+    '''
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip().lower()
+    match = relative_date.fullmatch(text)
+    if match:
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        return today - timedelta(days=int(match.group(1) or 0))
+    try:
+        return datetime.strptime(text, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"invalid date {value!r}, expected YYYY-MM-DD, 'today' or 'today-N'") from None
+
+def channel_name(url):
+    return url.rstrip('/').split('/')[-1]
+
+def checkpoint_path(url, mode, dates, directory='.'):
+    '''
+    parameters:
+        url: url of the channel
+        mode: 'week' or 'range'
+        dates: dates of the run (the week date, or the start and end dates)
+        directory: directory of the checkpoints
+    returns:
+        path of the checkpoint of the run, distinct for every channel, mode and dates
+        so runs going on at the same time never share a journal
+    '''
+    days = ' '.join(resolve_date(date).strftime('%Y-%m-%d') for date in dates)
+    return os.path.join(directory, f'crawl_checkpoint {channel_name(url)} {mode} {days}.jsonl')
+
+def _store_channel(channel):
+    # the store keys the articles on the channel name, as upserted by _frame
+    return None if channel is None else channel_name(channel)
+
+def crawl(url, start_date=None, workers=1, incremental=False, checkpoint=None, seen=None):
+    '''
+    parameters:
+        url: url of the channel
+        start_date: datetime of the oldest article needed, for incremental crawls
+        workers: number of pages fetched concurrently (1 fetches serially)
+        incremental: True to stop paginating once the pages are older than start_date
+            or already seen (only the recent pages are then returned)
+        checkpoint: CrawlCheckpoint to resume an interrupted crawl from (None to skip)
+        seen: SeenStore of the incremental crawls (the default seen_articles.json if None)
+    returns:
+        list of (Headline, URL, date text) tuples of the channel, in page order
+    '''
+    from bs4 import BeautifulSoup
+
+    from .fetcher import fetch
+    from .pages import get_total_pages, page_urls, parse_page, fetch_pages, crawl_incremental
+    from .seen import SeenStore
+
+    content = fetch(url).content
+    soup = BeautifulSoup(content, 'html.parser')
+    total_pages = get_total_pages(soup)
+    if checkpoint is not None:
+        # the journal is stale as soon as a new article pushed the rows down the pages
+        first_rows = parse_page(content)
+        checkpoint.start(url, total_pages, first_rows[0][1] if first_rows else None)
+
+    if incremental:
+        data = crawl_incremental(url, total_pages, start_date, seen or SeenStore(), max_workers=workers,
+                                 checkpoint=checkpoint)
+    else:
+        data = []
+        for rows in fetch_pages(page_urls(url, total_pages), max_workers=workers, checkpoint=checkpoint):
+            data += rows
+    if checkpoint is not None:
+        checkpoint.clear()
+    return data
+
+def _frame(url, data, store):
+    from .dates import to_frame
+    from .metrics import metrics
+
+    with metrics.stage('normalize'):
+        df, _ = to_frame(data)  # rows without a date are logged and counted in the metrics
+    if store is not None:
+        with metrics.stage('store'):
+            store.upsert(df, channel_name(url))
+    return df
+
+def _write_excel(rows, path):
+    import pandas as pd
+
+    from .metrics import metrics
+
+    with metrics.stage('export'):
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=columns)
+        df.assign(Date=df['Date'].dt.strftime(r'%b %d, %Y')).to_excel(path, index=False)
+
+def _all_updates_path(url, directory):
+    return os.path.join(directory, channel_name(url) + ' all updates ' + datetime.now().strftime(r'%d-%a-%Y') + '.xlsx')
+
+def extract_week(url, week_date, xls=False, workers=1, incremental=False, store=None, checkpoint=None,
+                 seen=None, directory='.'):
+    '''
+    parameters:
+        url: url of the channel
+        week_date: date of the week to retrieve the results
+        xls: True to save the results in excel sheets
+        workers: number of pages fetched concurrently (1 fetches serially)
+        incremental: True to stop paginating once the pages are older than the week
+            or already seen (the dataframe then only holds the recent pages)
+        store: ArticleStore to upsert the results into (None to skip)
+        checkpoint: CrawlCheckpoint to resume an interrupted crawl from (None to skip)
+        seen: SeenStore of the incremental crawls
+        directory: directory of the excel sheets
+    returns:
+        dataframe of the entire results and the (Headline, URL, Date) tuples of the week,
+        or ([], 'No updates this week')
+    '''
+    from .metrics import metrics
+    from .pages import week_first_day
+    from .weeks import rows_for_week
+
+    week_date = resolve_date(week_date)
+    data = crawl(url, week_first_day(week_date), workers, incremental, checkpoint, seen)
+    df = _frame(url, data, store)
+    with metrics.stage('weekly'):
+        week_updates = rows_for_week(df, week_date)
+
+    if len(week_updates):
+        if xls:
+            _write_excel(df, _all_updates_path(url, directory))
+            _write_excel(week_updates, os.path.join(
+                directory, f'{channel_name(url)} week_{week_date.strftime("%Y-%m-%d")}.xlsx'))
+        return (df, week_updates)
+    return ([], 'No updates this week')
+
+def extract_range(url, start_date, end_date, xls=False, workers=1, incremental=False, store=None,
+                  checkpoint=None, seen=None, directory='.'):
+    '''
+    parameters:
+        url: url of the channel
+        start_date: start date of the range to retrieve the results
+        end_date: end date of the range to retrieve the results
+        xls: True to save the results in an excel sheet
+        workers: number of pages fetched concurrently (1 fetches serially)
+        incremental: True to stop paginating once the pages are older than start_date
+            or already seen
+        store: ArticleStore to upsert the results into (None to skip)
+        checkpoint: CrawlCheckpoint to resume an interrupted crawl from (None to skip)
+        seen: SeenStore of the incremental crawls
+        directory: directory of the excel sheet
+    returns:
+        dataframe of the articles between start_date and end_date
+    '''
+    start_date = resolve_date(start_date)
+    end_date = resolve_date(end_date)
+    data = crawl(url, start_date, workers, incremental, checkpoint, seen)
+    df = _frame(url, data, store)
+    df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
+
+    if xls:
+        _write_excel(df, _all_updates_path(url, directory))
+    return df
+
+def weekly_data(df, week_date, xls=False, directory='.', channel=None):
+    '''
+    parameters:
+        df: dataframe of the imported excel sheet, or the ArticleStore to query
+        week_date: date of the week in the format %Y-%m-%d (2024-01-31)
+        xls: True to save the week updates in an excel sheet
+        directory: directory of the excel sheet
+        channel: name or url of the channel to query from the ArticleStore
+            (None returns the articles of every channel in the store)
+    returns:
+        (Headline, URL, Date) tuples of the week, or 'No updates this week'
+    '''
+    from .dates import as_datetimes
+    from .metrics import metrics
+    from .store import ArticleStore
+    from .weeks import rows_for_week
+
+    week_date = resolve_date(week_date)
+    with metrics.stage('weekly'):
+        if isinstance(df, ArticleStore):
+            week_updates = df.week(week_date, _store_channel(channel))
+        else:
+            df['Date'] = as_datetimes(df['Date'])
+            week_updates = rows_for_week(df, week_date)
+
+    if len(week_updates):
+        if xls:
+            _write_excel(week_updates, os.path.join(directory, f'week_{week_date.strftime("%Y-%m-%d")}.xlsx'))
+        return week_updates
+    return 'No updates this week'
+
+def range_data(df, start_date, end_date, xls=False, directory='.', channel=None):
+    '''
+    parameters:
+        df: dataframe of the imported excel sheet, or the ArticleStore to query
+        start_date: start date of the range to retrieve the results
+        end_date: end date of the range to retrieve the results
+        xls: True to save the week updates in an excel sheet
+        directory: directory of the excel sheet
+        channel: name or url of the channel to query from the ArticleStore
+            (None returns the articles of every channel in the store)
+    returns:
+        (Headline, URL, Date) tuples of the weeks inside the range, or 'No updates this week'
+    '''
+    from .metrics import metrics
+    from .store import ArticleStore
+    from .weeks import rows_for_weeks
+
+    start_date = resolve_date(start_date)
+    end_date = resolve_date(end_date)
+    with metrics.stage('weekly'):
+        if isinstance(df, ArticleStore):
+            week_updates = df.weeks(start_date, end_date, _store_channel(channel))
+        else:
+            week_updates = rows_for_weeks(df, start_date, end_date)
+
+    if len(week_updates):
+        if xls:
+            _write_excel(week_updates, os.path.join(
+                directory, f'week_{start_date.strftime("%Y-%m-%d")}_{end_date.strftime("%Y-%m-%d")}.xlsx'))
+        return week_updates
+    return 'No updates this week'
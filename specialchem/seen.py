@@ -0,0 +1,65 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+class SeenStore:
+    '''
+    Persistent record of the articles already seen on each channel.
+
+    The json file maps every channel url to the articles seen on it
+    ({url: [headline, date text]}) and to covered_since, the oldest date
+    down to which every article of the channel is known.
+    '''
+    def __init__(self, path='seen_articles.json'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.channels = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.channels = json.load(f)
+
+    def _channel(self, channel):
+        return self.channels.setdefault(channel, {'covered_since': None, 'articles': {}})
+
+    def articles(self, channel):
+        '''
+        parameters:
+            channel: url of the channel
+        returns:
+            dict of url -> (headline, date text) for every article seen on the channel
+        '''
+        with self._lock:
+            return {url: tuple(article) for url, article in self._channel(channel)['articles'].items()}
+
+    def covered_since(self, channel):
+        '''
+        parameters:
+            channel: url of the channel
+        returns:
+            datetime down to which every article of the channel is known, or None
+        '''
+        with self._lock:
+            covered = self._channel(channel)['covered_since']
+        return datetime.strptime(covered, '%Y-%m-%d') if covered else None
+
+    def add(self, channel, rows, covered_since=None):
+        '''
+        parameters:
+            channel: url of the channel
+            rows: (Headline, URL, Date) tuples fetched from the channel
+            covered_since: new oldest date down to which every article is known
+        '''
+        with self._lock:
+            record = self._channel(channel)
+            for headline, url, date in rows:
+                record['articles'][url] = [headline, date]
+            if covered_since is not None:
+                record['covered_since'] = covered_since.strftime('%Y-%m-%d')
+
+    def save(self):
+        with self._lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.channels, f)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,210 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .metrics import metrics
+from .pages import week_first_day
+
+class ArticleStore:
+    '''
+    Append-only SQLite store of the scraped articles, one row per URL and
+    channel, so an article listed by several channels is found in each.
+
+    Dates are kept as ISO dates (which sort and compare natively in SQLite)
+    together with the sunday of their week, both indexed per channel, so the
+    week and range queries of weekly_data are plain index lookups and come
+    back as datetime columns without reparsing any Excel sheet.
+    '''
+    def __init__(self, path='articles.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self._migrate()
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    headline TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    week_end TEXT NOT NULL,
+                    scraped_at TEXT NOT NULL,
+                    PRIMARY KEY (url, channel)
+                )''')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS articles_channel_date ON articles (channel, date)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS articles_week_end ON articles (week_end, channel)')
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS enrichments (
+                    url TEXT PRIMARY KEY,
+                    body TEXT,
+                    author TEXT,
+                    tags TEXT,
+                    enriched_at TEXT NOT NULL
+                )''')
+
+    def _migrate(self):
+        # stores created keyed on the url alone are rebuilt keyed on (url, channel)
+        keys = [row[1] for row in self.connection.execute('PRAGMA table_info(articles)') if row[5]]
+        if keys != ['url']:
+            return
+        self.connection.execute('DROP INDEX IF EXISTS articles_channel_date')
+        self.connection.execute('DROP INDEX IF EXISTS articles_week_end')
+        self.connection.execute('ALTER TABLE articles RENAME TO articles_by_url')
+        self.connection.execute('''
+            CREATE TABLE articles (
+                url TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                headline TEXT NOT NULL,
+                date TEXT NOT NULL,
+                week_end TEXT NOT NULL,
+                scraped_at TEXT NOT NULL,
+                PRIMARY KEY (url, channel)
+            )''')
+        self.connection.execute('''
+            INSERT INTO articles (url, channel, headline, date, week_end, scraped_at)
+            SELECT url, channel, headline, date, week_end, scraped_at FROM articles_by_url ORDER BY rowid''')
+        self.connection.execute('DROP TABLE articles_by_url')
+
+    def close(self):
+        self.connection.close()
+
+    def upsert(self, df, channel):
+        '''
+        parameters:
+            df: dataframe with Headline, URL and a datetime Date column
+            channel: channel the articles come from (sun-care)
+        returns:
+            number of rows written, the URLs already stored for the channel are updated in place
+        '''
+        scraped_at = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for headline, url, date in zip(df['Headline'], df['URL'], pd.to_datetime(df['Date'])):
+            if pd.isna(date):
+                continue
+            day = date.date()
+            week_end = day + timedelta(days=6 - day.weekday())
+            rows.append((url, channel, headline, day.isoformat(), week_end.isoformat(), scraped_at))
+        with self._lock, self.connection:
+            self.connection.executemany('''
+                INSERT INTO articles (url, channel, headline, date, week_end, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url, channel) DO UPDATE SET
+                    headline = excluded.headline,
+                    date = excluded.date,
+                    week_end = excluded.week_end,
+                    scraped_at = excluded.scraped_at''', rows)
+        return len(rows)
+
+    def _query(self, where, params, channel):
+        if channel is not None:
+            where += ' AND channel = ?'
+            params = params + (channel,)
+        with self._lock:
+            df = pd.read_sql_query(
+                f'SELECT headline AS Headline, url AS URL, date AS Date, channel AS Channel '
+                f'FROM articles WHERE {where} ORDER BY date, rowid',
+                self.connection, params=params)
+        df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d')
+        return df
+
+    def frame(self, channel=None, start_date=None, end_date=None):
+        '''
+        parameters:
+            channel: only return this channel (None for every channel)
+            start_date: oldest date to return (None for no limit)
+            end_date: newest date to return (None for no limit)
+        returns:
+            dataframe of Headline, URL, Date and Channel sorted by date
+        '''
+        first = pd.to_datetime(start_date).date().isoformat() if start_date is not None else '0001-01-01'
+        last = pd.to_datetime(end_date).date().isoformat() if end_date is not None else '9999-12-31'
+        return self._query('date BETWEEN ? AND ?', (first, last), channel)
+
+    def week(self, week_date, channel=None):
+        '''
+        parameters:
+            week_date: date of the week
+            channel: only return this channel (None for every channel)
+        returns:
+            list of (Headline, URL, Date) tuples of the week ending on the last sunday
+            on or before week_date, like weekly_data (each URL once across the channels)
+        '''
+        week_end = week_first_day(pd.to_datetime(week_date)) + timedelta(days=6)
+        df = self._query('week_end = ?', (week_end.date().isoformat(),), channel)
+        return _tuples(df)
+
+    def weeks(self, start_date, end_date, channel=None):
+        '''
+        parameters:
+            start_date: start date of the range
+            end_date: end date of the range
+            channel: only return this channel (None for every channel)
+        returns:
+            list of (Headline, URL, Date) tuples of the weeks whose sunday is on or after
+            start_date and that end (sunday + 6 days) on or before end_date, like weekly_data
+            (each URL once across the channels)
+        '''
+        first = pd.to_datetime(start_date).date()
+        last = pd.to_datetime(end_date).date() - timedelta(days=6)
+        df = self._query('week_end BETWEEN ? AND ?', (first.isoformat(), last.isoformat()), channel)
+        return _tuples(df)
+
+    def enriched_urls(self):
+        '''
+        returns:
+            set of the article URLs already enriched
+        '''
+        with self._lock:
+            return {row[0] for row in self.connection.execute('SELECT url FROM enrichments')}
+
+    def add_enrichments(self, records):
+        '''
+        parameters:
+            records: dicts with the URL, Body, Author and Tags (list) of articles
+        '''
+        enriched_at = datetime.now().isoformat(timespec='seconds')
+        rows = [(record['URL'], record['Body'], record['Author'], ','.join(record['Tags']), enriched_at)
+                for record in records]
+        with self._lock, self.connection:
+            self.connection.executemany('''
+                INSERT INTO enrichments (url, body, author, tags, enriched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    body = excluded.body,
+                    author = excluded.author,
+                    tags = excluded.tags,
+                    enriched_at = excluded.enriched_at''', rows)
+
+    def enrichments(self):
+        '''
+        returns:
+            dataframe of URL, Body, Author and Tags of every enriched article
+        '''
+        with self._lock:
+            return pd.read_sql_query(
+                'SELECT url AS URL, body AS Body, author AS Author, tags AS Tags FROM enrichments',
+                self.connection)
+
+    def export_excel(self, path, channel=None, start_date=None, end_date=None):
+        '''
+        Writes the selected articles to an Excel sheet with %b %d, %Y dates
+        '''
+        with metrics.stage('export'):
+            df = self.frame(channel, start_date, end_date)
+            df['Date'] = df['Date'].dt.strftime(r'%b %d, %Y')
+            df.to_excel(path, index=False)
+
+    def export_parquet(self, directory, channel=None):
+        '''
+        Writes the articles as a Parquet dataset partitioned by channel and week
+        '''
+        with metrics.stage('export'):
+            df = self.frame(channel)
+            df['Week'] = (df['Date'] + pd.to_timedelta(6 - df['Date'].dt.dayofweek, unit='D')).dt.strftime('%Y-%m-%d')
+            df.to_parquet(directory, partition_cols=['Channel', 'Week'], index=False)
+
+def _tuples(df):
+    df = df.drop_duplicates(subset='URL', keep='first')
+    return list(zip(df['Headline'], df['URL'], df['Date']))
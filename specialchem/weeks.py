@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+class WeekIndex:
+    '''
+    Sorted index of the rows of a dataframe by their week.
+
+    A week runs from monday to sunday and is keyed by its sunday, the same
+    buckets as df.groupby(pd.Grouper(key='Date', freq='W')), but the keys are
+    computed directly from the datetime column and looked up with a binary
+    search instead of building the list of every week.
+    '''
+    def __init__(self, df, key='Date'):
+        self.df = df
+        dates = pd.to_datetime(df[key]).to_numpy()
+        # stable sort by date keeps the dataframe order for equal dates, like groupby
+        self.order = np.argsort(dates, kind='stable')
+        days = dates[self.order].astype('datetime64[D]')
+        # 1970-01-01 was a thursday, so (days + 3) % 7 is 0 on mondays
+        weekday = (days.astype('int64') + 3) % 7
+        # sorted dates give sorted week keys, ready for a binary search
+        self.week_ends = days + (6 - weekday).astype('timedelta64[D]')
+
+    def _between(self, first_week_end, last_week_end):
+        low = np.searchsorted(self.week_ends, first_week_end, side='left')
+        high = np.searchsorted(self.week_ends, last_week_end, side='right')
+        return self.order[low:high]
+
+    def week(self, week_date):
+        '''
+        parameters:
+            week_date: date of the week
+        returns:
+            positions of the rows in the week ending on the last sunday on or before week_date
+        '''
+        day = np.datetime64(pd.to_datetime(week_date).date(), 'D')
+        week_end = day - np.timedelta64((int((day.astype('int64') + 3) % 7) + 1) % 7, 'D')
+        return self._between(week_end, week_end)
+
+    def weeks(self, start_date, end_date):
+        '''
+        parameters:
+            start_date: start date of the range
+            end_date: end date of the range
+        returns:
+            positions of the rows of the weeks whose sunday is on or after start_date
+            and that end (sunday + 6 days) on or before end_date, week by week
+        '''
+        first = np.datetime64(pd.to_datetime(start_date).date(), 'D')
+        last = np.datetime64(pd.to_datetime(end_date).date(), 'D') - np.timedelta64(6, 'D')
+        if last < first:
+            return self.order[:0]
+        return self._between(first, last)
+
+    def rows(self, positions):
+        '''
+        parameters:
+            positions: row positions returned by week or weeks
+        returns:
+            list of (Headline, URL, Date) tuples of those rows
+        '''
+        selected = self.df.iloc[positions]
+        return list(zip(selected['Headline'], selected['URL'], selected['Date']))
+
+def rows_for_week(df, week_date):
+    '''
+    parameters:
+        df: dataframe with Headline, URL and a datetime Date column
+        week_date: date of the week
+    returns:
+        list of (Headline, URL, Date) tuples of that week
+    '''
+    index = WeekIndex(df)
+    return index.rows(index.week(week_date))
+
+def rows_for_weeks(df, start_date, end_date):
+    '''
+    parameters:
+        df: dataframe with Headline, URL and a datetime Date column
+        start_date: start date of the range
+        end_date: end date of the range
+    returns:
+        list of (Headline, URL, Date) tuples of the weeks inside the range, week by week
+    '''
+    index = WeekIndex(df)
+    return index.rows(index.weeks(start_date, end_date))
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def channel_page(items, page_num, total_pages):
+    '''
+    parameters:
+        items: (slug, headline, date) of the articles of the page, date may be a text
+        page_num: number of the page
+        total_pages: number of pages in the pagination
+    returns:
+        html of a channel page with the specialchem markup
+    '''
+    articles = []
+    for slug, headline, day in items:
+        text = day if isinstance(day, str) else f'Published on {day.strftime("%b %d, %Y")}'
+        articles.append(f'<div class="item"><a class="titre float" href="/news/{slug}">{headline}</a>'
+                        f'<div class="date float dotted_line c5">{text}</div></div>')
+    pagination = ''.join(f'<a href="?indexpage={n}">{n}</a>' for n in range(1, total_pages + 1))
+    return (f'<html><body>{"".join(articles)}'
+            f'<div class="products-pagination">{pagination}<a href="?indexpage={min(page_num + 1, total_pages)}">Next</a></div>'
+            f'</body></html>')
+
+def channel_pages(total_pages, per_page=10, per_day=3, newest=date(2024, 6, 30)):
+    '''
+    returns:
+        html of every page of a channel, newest first, with per_day articles a day
+        (so the days straddle the page boundaries)
+    '''
+    pages = []
+    for page_num in range(1, total_pages + 1):
+        items = []
+        for item in range(per_page):
+            index = (page_num - 1) * per_page + item
+            items.append((f'article-{page_num}-{item}', f'Article {page_num}-{item}',
+                          newest - timedelta(days=index // per_day)))
+        pages.append(channel_page(items, page_num, total_pages))
+    return pages
+
+class StandIn:
+    '''
+    Local HTTP stand-in for the site. Routes map a path to a function of the
+    query string and the request headers returning (status, headers, body).
+    '''
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.request_headers = []
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with stand_in._lock:
+                    stand_in.requests.append(self.path)
+                    stand_in.request_headers.append(dict(self.headers))
+                route = stand_in.routes.get(url.path)
+                status, headers, body = route(parse_qs(url.query), self.headers) if route else (404, {}, b'')
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add_channel(self, name, pages):
+        '''
+        Serves pages (a list of html, may be changed later) at /channel/<name>?indexpage=<n>
+        returns:
+            url of the channel
+        '''
+        def route(query, headers):
+            page_num = int(query.get('indexpage', ['1'])[0])
+            if not 1 <= page_num <= len(pages):
+                return 404, {}, b''
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, pages[page_num - 1]
+
+        self.routes[f'/channel/{name}'] = route
+        return f'{self.base_url}/channel/{name}'
+
+    def add_page(self, path, body, status=200, headers=None):
+        self.routes[path] = lambda query, request_headers: (status, headers or {}, body)
+        return self.base_url + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    server.close()
+
+def reset_settings():
+    from specialchem import fetcher, pages
+
+    fetcher.use_cache(None)
+    fetcher.use_rate_limiter(None)
+    pages.use_parser()
+    pages.use_host_limit()
+
+@pytest.fixture(autouse=True)
+def default_settings():
+    # no response cache, rate limiter or parser setting leaking between tests
+    reset_settings()
+    yield
+    reset_settings()
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import channel_pages
+from specialchem.batch import job_keywords, run_batch
+from specialchem.scrape import checkpoint_path
+
+def test_job_keywords():
+    assert job_keywords({'keywords': ['uv', 'filter']}) == ['uv', 'filter']
+    assert job_keywords({'keywords': 'uv, filter,'}) == ['uv', 'filter']
+    with pytest.raises(ValueError):
+        job_keywords({'keywords': {'uv': 1}})
+    with pytest.raises(ValueError):
+        job_keywords({'keywords': ' , '})
+
+def test_checkpoint_paths_are_per_run():
+    url = 'https://cosmetics.specialchem.com/channel/sun-care'
+
+    paths = {
+        checkpoint_path(url, 'week', ['2024-04-05']),
+        checkpoint_path(url, 'week', ['2024-04-12']),
+        checkpoint_path(url, 'range', ['2024-04-05', '2024-04-30']),
+        checkpoint_path(url.replace('sun-care', 'hair-care'), 'week', ['2024-04-05']),
+    }
+    assert len(paths) == 4
+
+def test_keyword_string_matches_the_list(stand_in, tmp_path):
+    url = stand_in.add_channel('sun-care', channel_pages(2))
+    jobs = [
+        {'channel': url, 'keywords': 'Article 1-1, Article', 'match': 'any', 'workers': 2},
+        {'channel': url, 'keywords': ['Article 1-1', 'Article'], 'match': 'any', 'workers': 2},
+        {'channel': url, 'keywords': 3},
+    ]
+
+    results = run_batch(jobs, directory=str(tmp_path))
+
+    assert [result['status'] for result in results] == ['ok', 'ok', 'error']
+    assert results[0]['rows'] == results[1]['rows'] == 20
+
+def test_seen_articles_are_kept_in_the_directory(stand_in, tmp_path, monkeypatch):
+    url = stand_in.add_channel('sun-care', channel_pages(2))
+    monkeypatch.chdir(tmp_path)
+    directory = tmp_path / 'out'
+    directory.mkdir()
+
+    results = run_batch([{'channel': url, 'start': '2024-06-28', 'end': '2024-06-30', 'incremental': True}],
+                        directory=str(directory))
+
+    assert results[0]['status'] == 'ok'
+    assert (directory / 'seen_articles.json').exists()
+    assert not (tmp_path / 'seen_articles.json').exists()
@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+import requests
+
+from specialchem import fetcher
+from specialchem.cache import OfflineCacheMiss, ResponseCache
+
+def response(body, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    return response
+
+def age(cache, url, seconds):
+    # moves the stored_at of the cached entry back in time
+    meta_path, _ = cache._paths(url)
+    with open(meta_path, encoding='utf-8') as f:
+        entry = json.load(f)
+    entry['stored_at'] -= seconds
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+
+def test_fresh_hit_makes_no_request(stand_in, tmp_path):
+    url = stand_in.add_page('/news/a', 'article a')
+    fetcher.use_cache(ResponseCache(str(tmp_path)))
+
+    assert fetcher.fetch(url).text == 'article a'
+    assert fetcher.fetch(url).text == 'article a'
+    assert stand_in.requests == ['/news/a']
+
+def test_stale_entry_is_revalidated(stand_in, tmp_path):
+    def versioned(query, headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"', 'Last-Modified': 'Sun, 30 Jun 2024 12:00:00 GMT'}, 'article a'
+
+    stand_in.routes['/news/a'] = versioned
+    url = stand_in.base_url + '/news/a'
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    fetcher.use_cache(cache)
+
+    fetcher.fetch(url)
+    age(cache, url, 120)
+    revalidated = fetcher.fetch(url)
+
+    assert revalidated.status_code == 200
+    assert revalidated.text == 'article a'
+    assert len(stand_in.requests) == 2
+    assert stand_in.request_headers[1]['If-None-Match'] == '"v1"'
+    assert stand_in.request_headers[1]['If-Modified-Since'] == 'Sun, 30 Jun 2024 12:00:00 GMT'
+    # the 304 made the entry fresh again
+    assert cache.is_fresh(cache.get(url))
+
+def test_ttl_and_max_age(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_age=3600)
+    cache.put('https://example.com/a', response(b'a'))
+    cache.put('https://example.com/b', response(b'b'))
+
+    assert cache.is_fresh(cache.get('https://example.com/a'))
+    age(cache, 'https://example.com/a', 120)
+    assert not cache.is_fresh(cache.get('https://example.com/a'))
+
+    age(cache, 'https://example.com/b', 7200)
+    cache.evict()
+    assert cache.get('https://example.com/a') is not None
+    assert cache.get('https://example.com/b') is None
+
+def test_least_recently_used_are_evicted_by_size(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+    cache.put('https://example.com/a', response(b'a' * 100))
+    cache.put('https://example.com/b', response(b'b' * 100))
+    for name, accessed in (('a', 1000), ('b', 2000)):
+        os.utime(cache._paths(f'https://example.com/{name}')[1], (accessed, accessed))
+    # reading a makes b the least recently used
+    cache.get('https://example.com/a')
+
+    cache.put('https://example.com/c', response(b'c' * 100))
+
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a')['body'] == b'a' * 100
+    assert cache.get('https://example.com/c')['body'] == b'c' * 100
+
+def test_offline_replay(stand_in, tmp_path):
+    url = stand_in.add_page('/news/a', 'article a')
+    fetcher.use_cache(ResponseCache(str(tmp_path)))
+    fetcher.fetch(url)
+    stand_in.requests.clear()
+
+    offline = ResponseCache(str(tmp_path), ttl=0, offline=True)
+    fetcher.use_cache(offline)
+
+    # even a stale entry is replayed without any request
+    assert fetcher.fetch(url).text == 'article a'
+    with pytest.raises(OfflineCacheMiss):
+        fetcher.fetch(stand_in.base_url + '/news/b')
+    assert stand_in.requests == []
@@ -0,0 +1,30 @@
+from conftest import channel_pages
+from specialchem.checkpoint import CrawlCheckpoint
+from specialchem.pages import page_urls, parent_url
+from specialchem.scrape import crawl
+
+def test_resumes_only_the_same_crawl(tmp_path):
+    path = str(tmp_path / 'checkpoint.jsonl')
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.start('sun-care', 3, 'https://example.com/news/a')
+    checkpoint.record('sun-care?indexpage=1', [('A', 'https://example.com/news/a', 'Jun 30, 2024')])
+
+    assert list(CrawlCheckpoint(path).start('sun-care', 3, 'https://example.com/news/a')) == ['sun-care?indexpage=1']
+    assert CrawlCheckpoint(path).start('sun-care', 3, 'https://example.com/news/new') == {}
+
+def test_crawl_refetches_shifted_pages(stand_in, tmp_path):
+    pages = channel_pages(3)
+    url = stand_in.add_channel('sun-care', pages)
+    checkpoint = CrawlCheckpoint(str(tmp_path / 'checkpoint.jsonl'))
+    # an interrupted crawl that got the second page
+    stale = [('Stale', parent_url + '/news/stale', 'Published on Jun 01, 2024')]
+    checkpoint.start(url, 3, parent_url + '/news/article-1-0')
+    checkpoint.record(page_urls(url, 3)[1], stale)
+
+    # a new article on top of the first page pushes every row down
+    pages[0] = pages[0].replace('article-1-0', 'article-0-0')
+
+    data = crawl(url, checkpoint=checkpoint)
+
+    assert stale[0] not in data
+    assert len(data) == 30
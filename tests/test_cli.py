@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import channel_pages
+from specialchem import pages
+from specialchem.cli import main
+from specialchem.scrape import resolve_date
+
+def run(stand_in, tmp_path, *options):
+    url = stand_in.add_channel('sun-care', channel_pages(3))
+    return main(['range', url, '2024-06-27', '2024-06-30', '--directory', str(tmp_path),
+                 '--no-store', '--no-cache', '--no-rate-limit', *options])
+
+def test_range_prints_the_rows(stand_in, tmp_path, capsys):
+    assert run(stand_in, tmp_path) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    # 3 articles a day from june 30th down to june 27th
+    assert len(lines) == 12
+    assert lines[0].split('\t')[0] == '2024-06-30'
+
+def test_parser_options(stand_in, tmp_path, capsys):
+    pytest.importorskip('lxml')
+    assert run(stand_in, tmp_path, '--parser', 'lxml', '--restrict-parse', '--per-host', '2') == 0
+
+    assert (pages.parser_backend, pages.restrict_parse, pages.host_limit) == ('lxml', True, 2)
+    assert len(capsys.readouterr().out.splitlines()) == 12
+
+def test_enrich_prints_the_article_details(stand_in, tmp_path, capsys, monkeypatch):
+    from test_enrich import article
+
+    # the channel pages then link to the stand-in articles
+    monkeypatch.setattr(pages, 'parent_url', stand_in.base_url)
+    stand_in.add_page('/news/article-1-0', article)
+
+    assert run(stand_in, tmp_path, '--enrich') == 0
+
+    lines = [line.split('\t') for line in capsys.readouterr().out.splitlines()]
+    assert lines[0][1:] == ['Article 1-0', stand_in.base_url + '/news/article-1-0', 'Jane Doe', 'uv,filter']
+    # the other articles are 404s on the stand-in
+    assert lines[1][3:] == ['', '']
+
+def test_resolve_date():
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    assert resolve_date('today') == today
+    assert resolve_date(' Today-3 ') == today - timedelta(days=3)
+    assert resolve_date('2024-06-30') == datetime(2024, 6, 30)
+    for value in ['today+3', 'today3', 'yesterday', '2024-02-30']:
+        with pytest.raises(ValueError, match='today-N'):
+            resolve_date(value)
+
+def test_bad_date_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['range', 'sun-care', '2024-06-27', 'today+3', '--directory', str(tmp_path), '--no-store', '--no-cache'])
+
+    assert exit_info.value.code == 2
+    assert "argument end_date: invalid date 'today+3'" in capsys.readouterr().err
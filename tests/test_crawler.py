@@ -0,0 +1,30 @@
+from datetime import date
+
+from conftest import channel_page, channel_pages
+from specialchem.crawler import channel_url, crawl_channels, interleave
+
+def test_interleave_is_round_robin():
+    jobs = interleave([['a1', 'a2', 'a3'], ['b1'], ['c1', 'c2']])
+
+    assert [url for _, _, url in jobs] == ['a1', 'b1', 'c1', 'a2', 'c2', 'a3']
+    assert jobs[4] == (2, 1, 'c2')
+
+def test_channel_url():
+    assert channel_url('sun-care') == 'https://cosmetics.specialchem.com/channel/sun-care'
+    assert channel_url('https://example.com/channel/sun-care/') == 'https://example.com/channel/sun-care'
+
+def test_channels_share_urls_once(stand_in):
+    sun_care = stand_in.add_channel('sun-care', channel_pages(2))
+    # hair-care lists the newest sun-care article too
+    hair_care = stand_in.add_channel('hair-care', [channel_page(
+        [('hair-1', 'Hair 1', date(2024, 6, 30)), ('article-1-0', 'Article 1-0', date(2024, 6, 30))], 1, 1)])
+
+    df = crawl_channels([hair_care + '/', sun_care], max_workers=4)
+
+    assert len(df) == 2 + 20 - 1
+    assert list(df['Channel'][:2]) == ['hair-care', 'hair-care']
+    assert set(df['Channel'][2:]) == {'sun-care'}
+    # the shared article is kept for the first channel listing it
+    shared = df[df['URL'].str.endswith('/news/article-1-0')]
+    assert list(shared['Channel']) == ['hair-care']
+    assert str(df['Date'].dtype) == 'datetime64[ns]'
@@ -0,0 +1,68 @@
+import asyncio
+import glob
+import os
+from datetime import datetime
+
+import pytest
+
+from conftest import fixtures
+from specialchem.dates import date_rows, parse_date, to_frame
+from specialchem.metrics import metrics
+
+@pytest.fixture
+def saved_channel(stand_in):
+    contents = []
+    for path in sorted(glob.glob(os.path.join(fixtures, 'channel', 'sun-care_*.html'))):
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    # page 2 has a Feb 30 date and an empty one
+    return stand_in.add_channel('sun-care', contents)
+
+def failures():
+    return metrics.counters.get('date_failures_total', 0)
+
+def test_parse_date():
+    assert parse_date('Published on Apr 05, 2024') == datetime(2024, 4, 5)
+    assert parse_date('Published on Jun 27, 2024 | Updated on Jun 29, 2024') == datetime(2024, 6, 27)
+    assert parse_date('Published on Feb 30, 2024') is None
+    assert parse_date('Published on Foo 01, 2024') is None
+    assert parse_date('') is None
+
+def test_undated_rows_are_counted():
+    rows = [('A', 'a', 'Published on Apr 05, 2024'), ('B', 'b', 'soon'), ('C', 'c', None)]
+    before = failures()
+
+    assert date_rows(rows) == [('A', 'a', datetime(2024, 4, 5))]
+    df, failed = to_frame(rows)
+
+    assert list(df['URL']) == ['a']
+    assert failed == [('B', 'b', 'soon'), ('C', 'c', None)]
+    assert failures() - before == 4
+
+def test_crawler_counts_undated_rows(saved_channel):
+    from specialchem.crawler import crawl_channels
+
+    before = failures()
+    df = crawl_channels([saved_channel], max_workers=2)
+
+    assert len(df) == 10
+    assert failures() - before == 2
+
+def test_pipeline_counts_undated_rows(saved_channel):
+    from specialchem.pipeline import iter_records
+
+    before = failures()
+    records = list(iter_records(saved_channel))
+
+    assert len(records) == 10
+    assert failures() - before == 2
+
+def test_async_scraper_counts_undated_rows(saved_channel):
+    pytest.importorskip('aiohttp')
+    from specialchem.async_scraper import extract_range_async
+
+    before = failures()
+    df = asyncio.run(extract_range_async(saved_channel, '2023-01-01', '2024-12-31', concurrency=2))
+
+    assert len(df) == 10
+    assert failures() - before == 2
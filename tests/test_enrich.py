@@ -0,0 +1,42 @@
+from specialchem import enrich
+from specialchem.store import ArticleStore
+
+article = '''<html><head><meta name="author" content="Jane Doe"><meta name="keywords" content="uv, filter"></head>
+<body><article><p>Body of the article.</p></article></body></html>'''
+
+def test_failed_articles_are_not_stored(stand_in, tmp_path, monkeypatch):
+    found = stand_in.add_page('/news/found', article)
+    broken = stand_in.add_page('/news/broken', '<html>broken</html>')
+    missing = stand_in.base_url + '/news/missing'
+    parse_article = enrich.parse_article
+
+    def failing_parse(content):
+        if b'broken' in content:
+            raise AttributeError('unexpected markup')
+        return parse_article(content)
+
+    monkeypatch.setattr(enrich, 'parse_article', failing_parse)
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    reports = []
+
+    records = list(enrich.enrich([missing, broken, found], store, max_workers=2, on_batch=reports.append))
+
+    assert [record['URL'] for record in records] == [found]
+    assert records[0]['Author'] == 'Jane Doe'
+    assert records[0]['Tags'] == ['uv', 'filter']
+    # the 404 and the unparsable page are tried again by the next run
+    assert store.enriched_urls() == {found}
+    assert reports[0]['failed'] == 2
+    store.close()
+
+def test_enrich_frame_without_store(stand_in):
+    import pandas as pd
+
+    found = stand_in.add_page('/news/found', article)
+    missing = stand_in.base_url + '/news/missing'
+
+    df = enrich.enrich_frame(pd.DataFrame({'URL': [found, missing]}), None, max_workers=2)
+
+    assert df['Author'][0] == 'Jane Doe'
+    assert df['Tags'][0] == 'uv,filter'
+    assert pd.isna(df['Author'][1])
@@ -0,0 +1,72 @@
+import os
+from urllib.parse import urljoin
+
+import pytest
+from bs4 import BeautifulSoup
+
+from conftest import channel_pages, fixtures
+from specialchem.keywords import KeywordMatcher, filter_channels, filter_links
+
+url = 'https://cosmetics.specialchem.com/channel/sun-care'
+
+def saved_soup():
+    with open(os.path.join(fixtures, 'keywords', 'sun-care.html'), 'rb') as f:
+        return BeautifulSoup(f.read(), 'html.parser')
+
+def find_previous_links(soup, url, keywords):
+    # the lookup filter_links replaces: one find_previous walk per matching link
+    results = []
+    for link in soup.find_all('a'):
+        if link.get('href'):
+            link_content = link.text.strip().lower()
+            if all(keyword in link_content for keyword in keywords):
+                updated_date_element = link.find_previous('span', {'class': 'updated-date'})
+                updated_date = updated_date_element.text.strip() if updated_date_element else 'N/A'
+                results.append((link.text.strip(), urljoin(url, link.get('href')), updated_date))
+    return results
+
+@pytest.mark.parametrize('mode, text, expected', [
+    ('all', 'New UV Filter Approved', True),
+    ('all', 'Filter for uv', True),
+    ('all', 'New UV Shield', False),
+    ('any', 'New UV Shield', True),
+    ('any', 'Mineral Sprays', False),
+    ('phrase', 'Mineral UV \n Filter', True),
+    ('phrase', 'Filter for UV', False),
+])
+def test_matcher_modes(mode, text, expected):
+    assert KeywordMatcher([' UV', 'filter '], mode).matches(text) is expected
+
+def test_matcher_edge_cases():
+    assert KeywordMatcher([], 'any').matches('anything')
+    assert KeywordMatcher([' ', ''], 'phrase').matches('anything')
+    assert KeywordMatcher(['a.b'], 'any').matches('a.b') and not KeywordMatcher(['a.b'], 'any').matches('axb')
+    with pytest.raises(ValueError):
+        KeywordMatcher([], 'bogus')
+    with pytest.raises(ValueError):
+        KeywordMatcher(['uv'], 'bogus')
+
+@pytest.mark.parametrize('keywords', [['uv', 'filter'], ['uv'], [], ['sun']])
+def test_single_pass_matches_find_previous(keywords):
+    soup = saved_soup()
+
+    assert filter_links(soup, url, KeywordMatcher(keywords)) == find_previous_links(soup, url, keywords)
+
+def test_filter_links_dates():
+    links = filter_links(saved_soup(), url, KeywordMatcher(['uv', 'filter']))
+
+    assert [(link_url, updated) for _, link_url, updated in links] == [
+        ('https://cosmetics.specialchem.com/news/uv-filter-approved', 'N/A'),
+        ('https://cosmetics.specialchem.com/news/mineral-uv-filter', 'Updated on Jun 28, 2024'),
+        # the date nested in the link only counts for the links after it
+        ('https://example.com/uv/filter-guide', 'Updated on Jun 28, 2024'),
+        ('https://cosmetics.specialchem.com/news/water-resistant-filter', 'Updated on Jun 27, 2024'),
+    ]
+
+def test_filter_channels(stand_in):
+    channel = stand_in.add_channel('sun-care', channel_pages(3))
+
+    df = filter_channels([channel + '/'], ['article 2-'], max_workers=2)
+
+    assert len(df) == 10
+    assert set(df['Channel']) == {'sun-care'}
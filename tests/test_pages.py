@@ -0,0 +1,106 @@
+import pytest
+
+from conftest import channel_pages
+from specialchem import pages
+
+def test_parallel_fetch_matches_serial(stand_in):
+    url = stand_in.add_channel('sun-care', channel_pages(12))
+    urls = pages.page_urls(url, 12)
+
+    serial = pages.fetch_pages(urls)
+    parallel = pages.fetch_pages(urls, max_workers=5)
+
+    assert len(serial) == 12
+    assert all(len(rows) == 10 for rows in serial)
+    assert parallel == serial
+    # page order, not completion order
+    assert [rows[0][0] for rows in parallel] == [f'Article {page_num}-0' for page_num in range(1, 13)]
+
+def test_host_lock_is_per_host():
+    url = 'https://cosmetics.specialchem.com/channel/sun-care'
+
+    assert pages._host_lock(url, 4) is pages._host_lock(url + '?indexpage=2')
+    assert pages._host_lock('https://example.com/', 4) is not pages._host_lock(url, 4)
+    # a second limit would let both callers' requests in flight at once
+    with pytest.raises(ValueError):
+        pages._host_lock(url, 2)
+
+def test_host_limit_caps_the_workers(stand_in, monkeypatch):
+    import threading
+    import time
+
+    url = stand_in.add_channel('sun-care', channel_pages(8))
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+    fetch = pages.fetch
+
+    def counting_fetch(page_url):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        try:
+            return fetch(page_url)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    monkeypatch.setattr(pages, 'fetch', counting_fetch)
+    pages.use_host_limit(2)
+    try:
+        pages.fetch_pages(pages.page_urls(url, 8), max_workers=8)
+    finally:
+        pages.use_host_limit()
+    assert peak == 2
+
+def test_incremental_runs_keep_articles_of_the_page_boundary_day(stand_in, tmp_path):
+    from datetime import datetime, timedelta
+
+    from specialchem.dates import parse_date
+    from specialchem.seen import SeenStore
+
+    # four articles a day, so the oldest day of page 3 carries on to page 4
+    url = stand_in.add_channel('sun-care', channel_pages(6, per_day=4))
+    newest = datetime(2024, 6, 30)
+    full = [row for rows in pages.fetch_pages(pages.page_urls(url, 6)) for row in rows]
+
+    seen = SeenStore(str(tmp_path / 'seen.json'))
+    pages.crawl_incremental(url, 6, newest - timedelta(days=3), seen)
+    start_date = seen.covered_since(url)
+    again = pages.crawl_incremental(url, 6, start_date, seen)
+
+    expected = {row for row in full if parse_date(row[2]) >= start_date}
+    assert {row for row in again if parse_date(row[2]) >= start_date} == expected
+
+def test_incremental_run_to_the_last_page_covers_the_oldest_day(stand_in, tmp_path):
+    from datetime import datetime
+
+    from specialchem.seen import SeenStore
+
+    url = stand_in.add_channel('sun-care', channel_pages(3, per_day=4))
+    seen = SeenStore(str(tmp_path / 'seen.json'))
+    pages.crawl_incremental(url, 3, datetime(2024, 1, 1), seen)
+
+    # 30 articles, four a day: the last ones are 7 days before the newest
+    assert seen.covered_since(url) == datetime(2024, 6, 23)
+
+def test_repeat_incremental_run_fetches_one_page(stand_in, tmp_path):
+    from datetime import datetime
+
+    from specialchem.scrape import crawl
+    from specialchem.seen import SeenStore
+
+    url = stand_in.add_channel('sun-care', channel_pages(30))
+    seen = SeenStore(str(tmp_path / 'seen.json'))
+    first = crawl(url, datetime(2024, 6, 17), workers=8, incremental=True, seen=seen)
+    first_requests = len(stand_in.requests)
+    stand_in.requests.clear()
+
+    again = crawl(url, datetime(2024, 6, 24), workers=8, incremental=True, seen=seen)
+
+    # pages 1 to 6 reach past june 17th, fetched in windows of 1, 2 and 4 pages
+    assert first_requests == 1 + 7
+    # the channel url for the pagination, then the first page only
+    assert stand_in.requests == ['/channel/sun-care', '/channel/sun-care?indexpage=1']
+    assert {row[1] for row in again} <= {row[1] for row in first}
@@ -0,0 +1,42 @@
+import glob
+import os
+
+import pytest
+
+from conftest import fixtures
+from specialchem import pages
+
+def saved_pages():
+    paths = sorted(glob.glob(os.path.join(fixtures, 'channel', '*.html')))
+    assert paths
+    contents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            contents.append(f.read())
+    return contents
+
+@pytest.mark.parametrize('backend, restrict, module', [
+    ('html.parser', True, None),
+    ('lxml', False, 'lxml'),
+    ('lxml', True, 'lxml'),
+    ('selectolax', False, 'selectolax'),
+])
+def test_backends_match_html_parser(backend, restrict, module):
+    if module is not None:
+        pytest.importorskip(module)
+    assert pages.check_parity(saved_pages(), backend, restrict) == []
+
+def test_saved_pages_rows():
+    first = saved_pages()[0]
+
+    rows = pages.parse_page(first, 'html.parser', False)
+
+    # the sponsored link in the sidebar does not have the exact article classes
+    assert len(rows) == 5
+    assert rows[0] == ('New UV Filter Approved in the EU',
+                       pages.parent_url + '/news/industry-news/new-uv-filter-approved-000231',
+                       'Published on Jun 28, 2024')
+
+def test_use_parser_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        pages.use_parser('html5lib')
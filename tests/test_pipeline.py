@@ -0,0 +1,70 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import channel_pages
+from specialchem.pipeline import iter_records, iter_week_records, to_dataframe, write_csv, write_excel, write_parquet
+
+records = [(f'Article {day}', f'https://cosmetics.specialchem.com/news/{day}',
+            datetime(2024, 6, 30) - timedelta(days=day)) for day in range(10)]
+
+def test_stream_stops_at_the_first_older_page(stand_in):
+    url = stand_in.add_channel('sun-care', channel_pages(10))
+
+    streamed = list(iter_records(url, datetime(2024, 6, 24), datetime(2024, 6, 28)))
+
+    # 3 articles a day, june 24th is on page 3 and page 4 is entirely older
+    assert stand_in.requests == ['/channel/sun-care'] + [f'/channel/sun-care?indexpage={n}' for n in range(1, 5)]
+    assert len(streamed) == 5 * 3
+    assert {date for _, _, date in streamed} == {datetime(2024, 6, day) for day in range(24, 29)}
+
+def test_week_records(stand_in):
+    url = stand_in.add_channel('sun-care', channel_pages(10))
+
+    # the week ending on sunday june 23rd, 2024
+    week = list(iter_week_records(url, datetime(2024, 6, 25), max_workers=3))
+
+    assert {date for _, _, date in week} == {datetime(2024, 6, day) for day in range(17, 24)}
+
+def test_to_dataframe():
+    df = to_dataframe(iter(records), chunksize=3)
+
+    assert list(df['URL']) == [url for _, url, _ in records]
+    assert str(df['Date'].dtype) == 'datetime64[ns]'
+    assert len(to_dataframe(iter([]))) == 0
+
+def test_write_csv(tmp_path):
+    path = str(tmp_path / 'updates.csv')
+
+    assert write_csv(iter(records), path, chunksize=3) == 10
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['Headline', 'URL', 'Date']
+    assert rows[1] == ['Article 0', 'https://cosmetics.specialchem.com/news/0', 'Jun 30, 2024']
+    assert len(rows) == 11
+
+def test_write_excel(tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('openpyxl')
+    path = str(tmp_path / 'updates.xlsx')
+
+    assert write_excel(iter(records), path, chunksize=3) == 10
+
+    df = pd.read_excel(path)
+    assert list(df.columns) == ['Headline', 'URL', 'Date']
+    assert list(df['Date'][:2]) == ['Jun 30, 2024', 'Jun 29, 2024']
+    assert len(df) == 10
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / 'updates.parquet')
+
+    assert write_parquet(iter(records), path, chunksize=4) == 10
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == 3
+    table = parquet.read()
+    assert table.column('Headline').to_pylist() == [headline for headline, _, _ in records]
+    assert table.column('Date').to_pylist() == [date for _, _, date in records]
@@ -0,0 +1,83 @@
+import itertools
+
+import pytest
+
+from specialchem import fetcher
+from specialchem.ratelimit import AdaptiveRateLimiter, retry_after
+
+def test_retry_after_forms():
+    from datetime import datetime, timezone
+
+    now = datetime(2024, 6, 30, 12, 0, 0, tzinfo=timezone.utc)
+    assert retry_after('3') == 3.0
+    assert retry_after('Sun, 30 Jun 2024 12:00:05 GMT', now) == 5.0
+    assert retry_after('Sun, 30 Jun 2024 11:00:00 GMT', now) == 0.0
+    assert retry_after('soon') is None
+    assert retry_after(None) is None
+
+def test_retry_after_pauses_the_bucket():
+    limiter = AdaptiveRateLimiter(rate=100.0, burst=10)
+
+    limiter.on_response(429, 0.1, retry_after_seconds=2.0)
+
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.1)
+    # a Retry-After on a success is not a pause
+    limiter = AdaptiveRateLimiter(rate=100.0, burst=10)
+    limiter.on_response(200, 0.1, retry_after_seconds=2.0)
+    assert limiter.reserve() == 0.0
+
+def test_throttling_halves_the_rate_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5, cooldown=60.0)
+
+    limiter.on_response(429, 0.1)
+    limiter.on_response(503, 0.1)
+    limiter.on_error()
+
+    # the requests already in flight only count once
+    assert limiter.rate == 2.0
+
+    limiter.cooldown = 0.0
+    limiter.on_response(429, 0.1)
+    limiter.on_response(200, 5.0)  # slower than latency_target
+    limiter.on_error()
+    assert limiter.rate == 0.5  # 2 -> 1 -> 0.5, then floored at min_rate
+
+def test_healthy_responses_recover_the_rate():
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=3.0, increase=1.0)
+
+    limiter.on_response(200, 0.1)
+    assert limiter.rate == 2.0
+    limiter.on_response(404, 0.1)
+    assert limiter.rate == 2.5
+
+    for _ in range(50):
+        limiter.on_response(200, 0.1)
+    assert limiter.rate == 3.0
+
+def test_fetch_retries_a_throttled_request(stand_in):
+    attempts = itertools.count()
+
+    def throttled_once(query, headers):
+        if next(attempts) == 0:
+            return 429, {'Retry-After': '0'}, 'slow down'
+        return 200, {}, 'article'
+
+    stand_in.routes['/news/busy'] = throttled_once
+    limiter = AdaptiveRateLimiter(rate=50.0, burst=5)
+    fetcher.use_rate_limiter(limiter)
+
+    response = fetcher.fetch(stand_in.base_url + '/news/busy', backoff=0.01)
+
+    assert response.status_code == 200
+    assert response.text == 'article'
+    assert stand_in.requests == ['/news/busy', '/news/busy']
+    assert limiter.rate < 50.0
+
+def test_fetch_gives_up_after_the_retries(stand_in):
+    import requests
+
+    stand_in.add_page('/news/busy', 'slow down', status=429, headers={'Retry-After': '0'})
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        fetcher.fetch(stand_in.base_url + '/news/busy', retries=2, backoff=0.01)
+    assert len(stand_in.requests) == 3
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from specialchem.scrape import range_data, weekly_data
+from specialchem.store import ArticleStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    for channel in ('sun-care', 'hair-care'):
+        store.upsert(pd.DataFrame({
+            'Headline': [f'{channel} {day}' for day in (1, 2, 9)],
+            'URL': [f'https://cosmetics.specialchem.com/news/{channel}-{day}' for day in (1, 2, 9)],
+            'Date': [datetime(2024, 4, day) for day in (1, 2, 9)],
+        }), channel)
+    yield store
+    store.close()
+
+def test_weekly_data_only_returns_the_channel(store):
+    # the week ending on sunday april 7th, 2024
+    week_updates = weekly_data(store, '2024-04-08', channel='https://cosmetics.specialchem.com/channel/sun-care')
+
+    assert [headline for headline, _, _ in week_updates] == ['sun-care 1', 'sun-care 2']
+    assert len(weekly_data(store, '2024-04-08')) == 4
+
+def test_range_data_only_returns_the_channel(store):
+    week_updates = range_data(store, '2024-04-01', '2024-04-20', channel='hair-care')
+
+    assert [headline for headline, _, _ in week_updates] == ['hair-care 1', 'hair-care 2', 'hair-care 9']
+
+def test_shared_url_stays_in_every_channel(store):
+    shared = pd.DataFrame({'Headline': ['Shared'], 'URL': ['https://cosmetics.specialchem.com/news/shared'],
+                           'Date': [datetime(2024, 4, 3)]})
+    store.upsert(shared, 'sun-care')
+    store.upsert(shared, 'hair-care')
+
+    for channel in ('sun-care', 'hair-care'):
+        assert 'Shared' in [headline for headline, _, _ in store.week('2024-04-08', channel)]
+    assert [headline for headline, _, _ in store.week('2024-04-08')].count('Shared') == 1
+    assert len(store.frame(channel='hair-care')) == 4
+
+def test_store_keyed_on_url_is_migrated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / 'old.db')
+    connection = sqlite3.connect(path)
+    connection.execute('''CREATE TABLE articles (url TEXT PRIMARY KEY, channel TEXT NOT NULL, headline TEXT NOT NULL,
+                          date TEXT NOT NULL, week_end TEXT NOT NULL, scraped_at TEXT NOT NULL)''')
+    connection.execute("INSERT INTO articles VALUES ('https://example.com/a', 'sun-care', 'A', '2024-04-03', "
+                       "'2024-04-07', '2024-04-08T00:00:00')")
+    connection.commit()
+    connection.close()
+
+    store = ArticleStore(path)
+    store.upsert(pd.DataFrame({'Headline': ['A'], 'URL': ['https://example.com/a'], 'Date': [datetime(2024, 4, 3)]}),
+                 'hair-care')
+
+    assert store.week('2024-04-08', 'sun-care') == store.week('2024-04-08', 'hair-care')
+    assert len(store.week('2024-04-08', 'sun-care')) == 1
+    store.close()